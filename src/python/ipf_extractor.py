@@ -3,7 +3,57 @@ import os
 import zipfile
 import struct
 import io
+import mmap
 import time
+import tempfile
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Archives with fewer entries are extracted in-process; starting worker
+# processes would cost more than it saves
+PARALLEL_THRESHOLD = 256
+
+# Upper bound on auto-detected workers; past this the archive reads and
+# output writes saturate the disk and extra processes only add contention
+MAX_AUTO_WORKERS = 16
+
+# Entries per unit of work handed to a worker process
+FILENAME_BATCH_SIZE = 1024
+EXTRACT_BATCH_SIZE = 32
+
+# An extraction batch is also closed once its members add up to this many
+# compressed bytes, so a large member doesn't queue small ones behind it
+EXTRACT_BATCH_BYTES = 4 * 1024 * 1024
+
+# Read size when streaming a member to disk; small members still finish in
+# one read, large ones take a quarter as many decrypt/write round trips
+EXTRACT_BUFFER_SIZE = 262144
+
+# Files between wall-clock checks for the time-based progress refresh
+PROGRESS_CLOCK_STRIDE = 64
+
+# Members at least this large get their output size reserved before writing
+PREALLOCATE_THRESHOLD = 1024 * 1024
+
+# Members at least this large are evicted from the page cache once written
+EVICT_OUTPUT_THRESHOLD = 8 * 1024 * 1024
+
+# Byte values outside printable ASCII, stripped to validate decrypted filenames
+_NON_PRINTABLE_BYTES = bytes(range(32)) + bytes(range(127, 256))
+
+# decrypt_byte() for every value of the low 16 bits of key2, so the
+# keystream costs one lookup per byte instead of a multiply and shifts
+_KEYSTREAM_TAB = bytes(((t * (t ^ 1)) >> 8) & 0xff for t in (k | 2 for k in range(65536)))
+
+# IPF handles opened once per worker by _init_worker; thread-local so the
+# same code serves both process and thread pools
+_worker_state = threading.local()
+
+# zipfile and ZipCipher are pure Python, so workers are processes unless
+# the interpreter is a free-threaded (no-GIL) build where threads scale
+FREE_THREADED = not getattr(sys, '_is_gil_enabled', lambda: True)()
 
 def get_ipf_password():
     """
@@ -16,47 +66,54 @@ def get_ipf_password():
         0x20, 0x68, 0x20, 0x25, 0x73, 0x20, 0x2E, 0x3F, 0x2E, 0x20, 0x20, 0x20, 0x58, 0xFF, 0x24, 0x24
     ])
 
+# Built once; every filename and every member is decrypted with it
+_IPF_PASSWORD = get_ipf_password()
+
 class ZipCipher:
     """
     Implements the ZIP stream cipher for decrypting filenames and data
     Based on the PKWARE encryption algorithm
     """
-    def __init__(self):
-        # CRC32 table
-        self.crc32_tab = [
-            0x00000000, 0x77073096, 0xee0e612c, 0x990951ba, 0x076dc419, 0x706af48f, 0xe963a535, 0x9e6495a3,
-            0x0edb8832, 0x79dcb8a4, 0xe0d5e91e, 0x97d2d988, 0x09b64c2b, 0x7eb17cbd, 0xe7b82d07, 0x90bf1d91,
-            0x1db71064, 0x6ab020f2, 0xf3b97148, 0x84be41de, 0x1adad47d, 0x6ddde4eb, 0xf4d4b551, 0x83d385c7,
-            0x136c9856, 0x646ba8c0, 0xfd62f97a, 0x8a65c9ec, 0x14015c4f, 0x63066cd9, 0xfa0f3d63, 0x8d080df5,
-            0x3b6e20c8, 0x4c69105e, 0xd56041e4, 0xa2677172, 0x3c03e4d1, 0x4b04d447, 0xd20d85fd, 0xa50ab56b,
-            0x35b5a8fa, 0x42b2986c, 0xdbbbc9d6, 0xacbcf940, 0x32d86ce3, 0x45df5c75, 0xdcd60dcf, 0xabd13d59,
-            0x26d930ac, 0x51de003a, 0xc8d75180, 0xbfd06116, 0x21b4f4b5, 0x56b3c423, 0xcfba9599, 0xb8bda50f,
-            0x2802b89e, 0x5f058808, 0xc60cd9b2, 0xb10be924, 0x2f6f7c87, 0x58684c11, 0xc1611dab, 0xb6662d3d,
-            0x76dc4190, 0x01db7106, 0x98d220bc, 0xefd5102a, 0x71b18589, 0x06b6b51f, 0x9fbfe4a5, 0xe8b8d433,
-            0x7807c9a2, 0x0f00f934, 0x9609a88e, 0xe10e9818, 0x7f6a0dbb, 0x086d3d2d, 0x91646c97, 0xe6635c01,
-            0x6b6b51f4, 0x1c6c6162, 0x856530d8, 0xf262004e, 0x6c0695ed, 0x1b01a57b, 0x8208f4c1, 0xf50fc457,
-            0x65b0d9c6, 0x12b7e950, 0x8bbeb8ea, 0xfcb9887c, 0x62dd1ddf, 0x15da2d49, 0x8cd37cf3, 0xfbd44c65,
-            0x4db26158, 0x3ab551ce, 0xa3bc0074, 0xd4bb30e2, 0x4adfa541, 0x3dd895d7, 0xa4d1c46d, 0xd3d6f4fb,
-            0x4369e96a, 0x346ed9fc, 0xad678846, 0xda60b8d0, 0x44042d73, 0x33031de5, 0xaa0a4c5f, 0xdd0d7cc9,
-            0x5005713c, 0x270241aa, 0xbe0b1010, 0xc90c2086, 0x5768b525, 0x206f85b3, 0xb966d409, 0xce61e49f,
-            0x5edef90e, 0x29d9c998, 0xb0d09822, 0xc7d7a8b4, 0x59b33d17, 0x2eb40d81, 0xb7bd5c3b, 0xc0ba6cad,
-            0xedb88320, 0x9abfb3b6, 0x03b6e20c, 0x74b1d29a, 0xead54739, 0x9dd277af, 0x04db2615, 0x73dc1683,
-            0xe3630b12, 0x94643b84, 0x0d6d6a3e, 0x7a6a5aa8, 0xe40ecf0b, 0x9309ff9d, 0x0a00ae27, 0x7d079eb1,
-            0xf00f9344, 0x8708a3d2, 0x1e01f268, 0x6906c2fe, 0xf762575d, 0x806567cb, 0x196c3671, 0x6e6b06e7,
-            0xfed41b76, 0x89d32be0, 0x10da7a5a, 0x67dd4acc, 0xf9b9df6f, 0x8ebeeff9, 0x17b7be43, 0x60b08ed5,
-            0xd6d6a3e8, 0xa1d1937e, 0x38d8c2c4, 0x4fdff252, 0xd1bb67f1, 0xa6bc5767, 0x3fb506dd, 0x48b2364b,
-            0xd80d2bda, 0xaf0a1b4c, 0x36034af6, 0x41047a60, 0xdf60efc3, 0xa867df55, 0x316e8eef, 0x4669be79,
-            0xcb61b38c, 0xbc66831a, 0x256fd2a0, 0x5268e236, 0xcc0c7795, 0xbb0b4703, 0x220216b9, 0x5505262f,
-            0xc5ba3bbe, 0xb2bd0b28, 0x2bb45a92, 0x5cb36a04, 0xc2d7ffa7, 0xb5d0cf31, 0x2cd99e8b, 0x5bdeae1d,
-            0x9b64c2b0, 0xec63f226, 0x756aa39c, 0x026d930a, 0x9c0906a9, 0xeb0e363f, 0x72076785, 0x05005713,
-            0x95bf4a82, 0xe2b87a14, 0x7bb12bae, 0x0cb61b38, 0x92d28e9b, 0xe5d5be0d, 0x7cdcefb7, 0x0bdbdf21,
-            0x86d3d2d4, 0xf1d4e242, 0x68ddb3f8, 0x1fda836e, 0x81be16cd, 0xf6b9265b, 0x6fb077e1, 0x18b74777,
-            0x88085ae6, 0xff0f6a70, 0x66063bca, 0x11010b5c, 0x8f659eff, 0xf862ae69, 0x616bffd3, 0x166ccf45,
-            0xa00ae278, 0xd70dd2ee, 0x4e048354, 0x3903b3c2, 0xa7672661, 0xd06016f7, 0x4969474d, 0x3e6e77db,
-            0xaed16a4a, 0xd9d65adc, 0x40df0b66, 0x37d83bf0, 0xa9bcae53, 0xdebb9ec5, 0x47b2cf7f, 0x30b5ffe9,
-            0xbdbdf21c, 0xcabac28a, 0x53b39330, 0x24b4a3a6, 0xbad03605, 0xcdd70693, 0x54de5729, 0x23d967bf,
-            0xb3667a2e, 0xc4614ab8, 0x5d681b02, 0x2a6f2b94, 0xb40bbe37, 0xc30c8ea1, 0x5a05df1b, 0x2d02ef8d
-        ]
+    # CRC32 table, built once at import and shared by every instance
+    crc32_tab = [
+        0x00000000, 0x77073096, 0xee0e612c, 0x990951ba, 0x076dc419, 0x706af48f, 0xe963a535, 0x9e6495a3,
+        0x0edb8832, 0x79dcb8a4, 0xe0d5e91e, 0x97d2d988, 0x09b64c2b, 0x7eb17cbd, 0xe7b82d07, 0x90bf1d91,
+        0x1db71064, 0x6ab020f2, 0xf3b97148, 0x84be41de, 0x1adad47d, 0x6ddde4eb, 0xf4d4b551, 0x83d385c7,
+        0x136c9856, 0x646ba8c0, 0xfd62f97a, 0x8a65c9ec, 0x14015c4f, 0x63066cd9, 0xfa0f3d63, 0x8d080df5,
+        0x3b6e20c8, 0x4c69105e, 0xd56041e4, 0xa2677172, 0x3c03e4d1, 0x4b04d447, 0xd20d85fd, 0xa50ab56b,
+        0x35b5a8fa, 0x42b2986c, 0xdbbbc9d6, 0xacbcf940, 0x32d86ce3, 0x45df5c75, 0xdcd60dcf, 0xabd13d59,
+        0x26d930ac, 0x51de003a, 0xc8d75180, 0xbfd06116, 0x21b4f4b5, 0x56b3c423, 0xcfba9599, 0xb8bda50f,
+        0x2802b89e, 0x5f058808, 0xc60cd9b2, 0xb10be924, 0x2f6f7c87, 0x58684c11, 0xc1611dab, 0xb6662d3d,
+        0x76dc4190, 0x01db7106, 0x98d220bc, 0xefd5102a, 0x71b18589, 0x06b6b51f, 0x9fbfe4a5, 0xe8b8d433,
+        0x7807c9a2, 0x0f00f934, 0x9609a88e, 0xe10e9818, 0x7f6a0dbb, 0x086d3d2d, 0x91646c97, 0xe6635c01,
+        0x6b6b51f4, 0x1c6c6162, 0x856530d8, 0xf262004e, 0x6c0695ed, 0x1b01a57b, 0x8208f4c1, 0xf50fc457,
+        0x65b0d9c6, 0x12b7e950, 0x8bbeb8ea, 0xfcb9887c, 0x62dd1ddf, 0x15da2d49, 0x8cd37cf3, 0xfbd44c65,
+        0x4db26158, 0x3ab551ce, 0xa3bc0074, 0xd4bb30e2, 0x4adfa541, 0x3dd895d7, 0xa4d1c46d, 0xd3d6f4fb,
+        0x4369e96a, 0x346ed9fc, 0xad678846, 0xda60b8d0, 0x44042d73, 0x33031de5, 0xaa0a4c5f, 0xdd0d7cc9,
+        0x5005713c, 0x270241aa, 0xbe0b1010, 0xc90c2086, 0x5768b525, 0x206f85b3, 0xb966d409, 0xce61e49f,
+        0x5edef90e, 0x29d9c998, 0xb0d09822, 0xc7d7a8b4, 0x59b33d17, 0x2eb40d81, 0xb7bd5c3b, 0xc0ba6cad,
+        0xedb88320, 0x9abfb3b6, 0x03b6e20c, 0x74b1d29a, 0xead54739, 0x9dd277af, 0x04db2615, 0x73dc1683,
+        0xe3630b12, 0x94643b84, 0x0d6d6a3e, 0x7a6a5aa8, 0xe40ecf0b, 0x9309ff9d, 0x0a00ae27, 0x7d079eb1,
+        0xf00f9344, 0x8708a3d2, 0x1e01f268, 0x6906c2fe, 0xf762575d, 0x806567cb, 0x196c3671, 0x6e6b06e7,
+        0xfed41b76, 0x89d32be0, 0x10da7a5a, 0x67dd4acc, 0xf9b9df6f, 0x8ebeeff9, 0x17b7be43, 0x60b08ed5,
+        0xd6d6a3e8, 0xa1d1937e, 0x38d8c2c4, 0x4fdff252, 0xd1bb67f1, 0xa6bc5767, 0x3fb506dd, 0x48b2364b,
+        0xd80d2bda, 0xaf0a1b4c, 0x36034af6, 0x41047a60, 0xdf60efc3, 0xa867df55, 0x316e8eef, 0x4669be79,
+        0xcb61b38c, 0xbc66831a, 0x256fd2a0, 0x5268e236, 0xcc0c7795, 0xbb0b4703, 0x220216b9, 0x5505262f,
+        0xc5ba3bbe, 0xb2bd0b28, 0x2bb45a92, 0x5cb36a04, 0xc2d7ffa7, 0xb5d0cf31, 0x2cd99e8b, 0x5bdeae1d,
+        0x9b64c2b0, 0xec63f226, 0x756aa39c, 0x026d930a, 0x9c0906a9, 0xeb0e363f, 0x72076785, 0x05005713,
+        0x95bf4a82, 0xe2b87a14, 0x7bb12bae, 0x0cb61b38, 0x92d28e9b, 0xe5d5be0d, 0x7cdcefb7, 0x0bdbdf21,
+        0x86d3d2d4, 0xf1d4e242, 0x68ddb3f8, 0x1fda836e, 0x81be16cd, 0xf6b9265b, 0x6fb077e1, 0x18b74777,
+        0x88085ae6, 0xff0f6a70, 0x66063bca, 0x11010b5c, 0x8f659eff, 0xf862ae69, 0x616bffd3, 0x166ccf45,
+        0xa00ae278, 0xd70dd2ee, 0x4e048354, 0x3903b3c2, 0xa7672661, 0xd06016f7, 0x4969474d, 0x3e6e77db,
+        0xaed16a4a, 0xd9d65adc, 0x40df0b66, 0x37d83bf0, 0xa9bcae53, 0xdebb9ec5, 0x47b2cf7f, 0x30b5ffe9,
+        0xbdbdf21c, 0xcabac28a, 0x53b39330, 0x24b4a3a6, 0xbad03605, 0xcdd70693, 0x54de5729, 0x23d967bf,
+        0xb3667a2e, 0xc4614ab8, 0x5d681b02, 0x2a6f2b94, 0xb40bbe37, 0xc30c8ea1, 0x5a05df1b, 0x2d02ef8d
+    ]
+
+    def __init__(self, keys=None):
+        # Optionally start from a precomputed key state instead of init_keys()
+        if keys is not None:
+            self.keys = list(keys)
 
     def init_keys(self, password):
         """Initialize encryption keys with password"""
@@ -88,56 +145,77 @@ class ZipCipher:
 
     def decrypt_data(self, data):
         """Decrypt a sequence of bytes"""
+        # Hot loop: keep the keys and table in locals and inline
+        # decrypt_byte/update_keys so each byte costs no method calls
+        crc32_tab = self.crc32_tab
+        keystream_tab = _KEYSTREAM_TAB
+        key0, key1, key2 = self.keys
         decrypted = bytearray()
+        append = decrypted.append
         for byte_val in data:
-            decrypted_byte = byte_val ^ self.decrypt_byte()
-            decrypted.append(decrypted_byte)
-            self.update_keys(decrypted_byte)
+            byte_val ^= keystream_tab[key2 & 0xffff]
+            append(byte_val)
+            key0 = crc32_tab[(key0 ^ byte_val) & 0xff] ^ (key0 >> 8)
+            key1 = ((key1 + (key0 & 0xff)) * 134775813 + 1) & 0xffffffff
+            key2 = crc32_tab[(key2 ^ (key1 >> 24)) & 0xff] ^ (key2 >> 8)
+        self.keys = [key0, key1, key2]
         return bytes(decrypted)
 
-def read_file_chunk(file, offset, size):
-    """Read a specific chunk from file efficiently"""
-    file.seek(offset)
-    return file.read(size)
+def _compute_initial_keys(password):
+    """Key state left by init_keys(password)"""
+    cipher = ZipCipher()
+    cipher.init_keys(password)
+    return tuple(cipher.keys)
+
+# Every entry starts from the same password, so its 48 key updates are
+# done once here and each cipher starts from a copy of the result
+_INITIAL_KEYS = _compute_initial_keys(_IPF_PASSWORD)
 
-def decode_filename_from_local_header(file, file_info):
+def map_ipf(file):
     """
-    Extract and decrypt the filename from the local file header using streaming
+    Map an open IPF read-only for header reads
+    Entries are visited in archive order, which walks the file front to back,
+    so the kernel is told to read ahead sequentially rather than fault in one
+    page per local header.
+    """
+    ipf_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+        ipf_map.madvise(mmap.MADV_SEQUENTIAL)
+    if hasattr(os, 'posix_fadvise'):
+        # Extraction reads the same range through the file object
+        os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return ipf_map
+
+def decode_filename_from_local_header(ipf_map, local_header_offset):
+    """
+    Extract and decrypt the filename from the local file header of a mapped IPF
     """
-    local_header_offset = file_info.header_offset
-
     # Get filename length from local header
     name_len_offset = local_header_offset + 26  # Filename length offset
-    name_len_bytes = read_file_chunk(file, name_len_offset, 2)
-
-    if len(name_len_bytes) != 2:
+    if name_len_offset + 2 > len(ipf_map):
         return None
 
-    name_len = struct.unpack('<H', name_len_bytes)[0]
+    name_len = struct.unpack_from('<H', ipf_map, name_len_offset)[0]
 
     if name_len == 0 or name_len > 512:  # Reasonable filename length limit
         return None
 
-    # Read encrypted filename
+    # Slice encrypted filename straight out of the mapping (no seek/read)
     filename_offset = local_header_offset + 30  # After local header
-    encrypted_name = read_file_chunk(file, filename_offset, name_len)
+    encrypted_name = ipf_map[filename_offset:filename_offset + name_len]
 
     if len(encrypted_name) != name_len:
         return None
 
     # Decrypt using ZIP cipher
-    cipher = ZipCipher()
-    cipher.init_keys(get_ipf_password())
+    cipher = ZipCipher(_INITIAL_KEYS)
     decrypted_name = cipher.decrypt_data(encrypted_name)
 
-    # Try to decode as text
-    for encoding in ['utf-8', 'latin-1', 'cp1252', 'ascii']:
-        try:
-            decoded = decrypted_name.decode(encoding)
-            if decoded and all(32 <= ord(c) <= 126 or c in '._-/' for c in decoded):
-                return decoded
-        except:
-            continue
+    # Printable ASCII names (the common case) are checked in one C-level
+    # pass; utf-8, latin-1 and cp1252 all decode such bytes identically and
+    # accept nothing else as printable, so no per-encoding loop is needed
+    if decrypted_name and len(decrypted_name.translate(None, _NON_PRINTABLE_BYTES)) == len(decrypted_name):
+        return decrypted_name.decode('ascii')
 
     # Fallback: try to detect Japanese encoding
     try:
@@ -173,7 +251,301 @@ def make_safe_filename(filename):
 
     return safe
 
-def process_ipf_file(ipf_path, output_dir="extracted", verbose=False):
+def _casefold_path(path):
+    """Collision key for filesystems that ignore case"""
+    return os.path.normcase(path).casefold()
+
+def output_path_key(output_dir):
+    """
+    Return the function that maps output paths to collision keys
+    The filesystem decides whether two names collide, not the OS: macOS and
+    Windows volumes usually ignore case (where normcase alone doesn't fold
+    it on macOS), and Linux can mount such volumes too. Probe output_dir
+    once with a lowercase file and look it up in uppercase.
+    """
+    try:
+        with tempfile.NamedTemporaryFile(prefix='ipf_case_probe_', dir=output_dir) as probe:
+            probe_name = os.path.basename(probe.name)
+            case_insensitive = os.path.exists(os.path.join(output_dir, probe_name.upper()))
+    except OSError:
+        case_insensitive = sys.platform in ('win32', 'darwin')
+    return _casefold_path if case_insensitive else os.path.normcase
+
+def resolve_output_path(output_dir, safe_filename, used_paths, next_suffix, path_key=os.path.normcase):
+    """
+    Pick a free output path, adding a number on name collisions
+    next_suffix remembers where the search for each name stopped; paths are
+    only ever added to used_paths, so resuming there finds the same number
+    as counting up from 1 without rescanning every earlier duplicate. That
+    holds only while used_paths and next_suffix are keyed with the same
+    path_key, so every lookup and insert below goes through it.
+    """
+    output_path = os.path.join(output_dir, safe_filename)
+    key = path_key(output_path)
+    if key in used_paths:
+        name, ext = os.path.splitext(output_path)
+        counter = next_suffix.get(key, 1)
+        output_path = f"{name}_{counter}{ext}"
+        while path_key(output_path) in used_paths:
+            counter += 1
+            output_path = f"{name}_{counter}{ext}"
+        next_suffix[key] = counter + 1
+    used_paths.add(path_key(output_path))
+    return output_path
+
+def open_encrypted_member(ipf_map, file_info, password):
+    """
+    Start decrypting a stored or deflated member straight from the mapped IPF
+    zipfile runs ZipCrypto through its own per-byte closure; ZipCipher is
+    noticeably faster, so the common case skips zipfile's reader entirely.
+    Returns an iterator over the member's contents, or None when the entry
+    needs something only zipfile handles (other compression methods, data
+    descriptors, a bad password check byte), so zipfile can take it and
+    report the problem the usual way.
+    """
+    if not file_info.flag_bits & 0x1 or file_info.flag_bits & 0x68:
+        return None
+    if file_info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+        return None
+
+    header_offset = file_info.header_offset
+    if ipf_map[header_offset:header_offset + 4] != b'PK\x03\x04':
+        return None
+    name_len, extra_len = struct.unpack_from('<HH', ipf_map, header_offset + 26)
+    data_start = header_offset + 30 + name_len + extra_len
+
+    cipher = ZipCipher(_INITIAL_KEYS)
+    if password != _IPF_PASSWORD:
+        cipher.init_keys(password)
+    encryption_header = cipher.decrypt_data(ipf_map[data_start:data_start + 12])
+    if len(encryption_header) != 12 or encryption_header[11] != (file_info.CRC >> 24) & 0xff:
+        return None
+
+    return _iter_decrypted_member(ipf_map, data_start + 12,
+                                  data_start + file_info.compress_size, file_info, cipher)
+
+def _iter_decrypted_member(ipf_map, start, end, file_info, cipher):
+    """
+    Decrypt, inflate and CRC-check a member's data in EXTRACT_BUFFER_SIZE steps
+    Like zipfile's reader, output stops at file_size: inflate is bounded by the
+    bytes still expected, anything the stream holds past that is dropped, and
+    the CRC over what was produced decides whether a long or short stream is
+    an error.
+    """
+    decompressor = zlib.decompressobj(-15) if file_info.compress_type == zipfile.ZIP_DEFLATED else None
+    remaining = file_info.file_size
+    crc = 0
+    pos = start
+    while pos < end and remaining > 0 and not (decompressor and decompressor.eof):
+        data = cipher.decrypt_data(ipf_map[pos:min(pos + EXTRACT_BUFFER_SIZE, end)])
+        pos += EXTRACT_BUFFER_SIZE
+        while data and remaining > 0:
+            if decompressor:
+                # max_length keeps one chunk from inflating past file_size;
+                # whatever input that leaves over comes back as unconsumed_tail
+                chunk = decompressor.decompress(data, remaining)
+                data = decompressor.unconsumed_tail
+            else:
+                chunk, data = data[:remaining], b''
+            remaining -= len(chunk)
+            crc = zlib.crc32(chunk, crc)
+            yield chunk
+    if decompressor and remaining > 0 and not decompressor.eof:
+        chunk = decompressor.flush()[:remaining]
+        remaining -= len(chunk)
+        crc = zlib.crc32(chunk, crc)
+        yield chunk
+    if crc != file_info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for file {file_info.filename!r}")
+
+def _iter_zipfile_member(ipf_zip, file_info, password):
+    """Stream a member through zipfile's own reader"""
+    with ipf_zip.open(file_info, pwd=password) as member_file:
+        while True:
+            chunk = member_file.read(EXTRACT_BUFFER_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+def extract_member(ipf_zip, ipf_map, file_info, output_path, password):
+    """Stream a single archive member to output_path"""
+    chunks = open_encrypted_member(ipf_map, file_info, password)
+    if chunks is None:
+        chunks = _iter_zipfile_member(ipf_zip, file_info, password)
+        # Let zipfile raise on a broken header before the output is created
+        first_chunk = next(chunks, b'')
+    else:
+        first_chunk = b''
+
+    with open(output_path, 'wb') as output_file:
+        preallocated = False
+        if file_info.file_size >= PREALLOCATE_THRESHOLD and hasattr(os, 'posix_fallocate'):
+            # Reserve the final size up front so the filesystem can lay the
+            # file out in one extent instead of growing it write by write
+            try:
+                os.posix_fallocate(output_file.fileno(), 0, file_info.file_size)
+                preallocated = True
+            except OSError:
+                pass
+
+        # Stream the file in chunks to handle large files
+        try:
+            output_file.write(first_chunk)
+            for chunk in chunks:
+                output_file.write(chunk)
+        except BaseException:
+            if preallocated:
+                # Don't leave a failed output at full size, zero-padded
+                # past the bytes that were actually extracted
+                try:
+                    output_file.truncate(output_file.tell())
+                except OSError:
+                    pass
+            raise
+
+        if file_info.file_size >= EVICT_OUTPUT_THRESHOLD and hasattr(os, 'posix_fadvise'):
+            # Start writeback and drop the pages so large outputs don't
+            # crowd the archive reads out of the page cache
+            output_file.flush()
+            os.posix_fadvise(output_file.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+def extract_entries(ipf_zip, ipf_map, tasks, output_dir, password):
+    """
+    Extract (index, file_info, output_path) tasks, falling back to a
+    numbered name when an entry fails. Yields (index, error, fallback_error)
+    per task, with errors as strings
+    """
+    for index, file_info, output_path in tasks:
+        error = fallback_error = None
+        try:
+            extract_member(ipf_zip, ipf_map, file_info, output_path, password)
+        except Exception as e:
+            error = str(e)
+            # Try fallback extraction with streaming
+            try:
+                fallback_path = os.path.join(output_dir, f"fallback_{index:04d}.bin")
+                extract_member(ipf_zip, ipf_map, file_info, fallback_path, password)
+            except Exception as e:
+                fallback_error = str(e)
+        yield index, error, fallback_error
+
+def _init_worker(ipf_path, password):
+    """Open and map the IPF once per worker"""
+    _worker_state.password = password
+    file = open(ipf_path, 'rb')
+    _worker_state.map = map_ipf(file)
+    _worker_state.zip = zipfile.ZipFile(file)
+
+def _decode_filename_batch(header_offsets):
+    """Decrypt the filenames of one batch of entries (runs in a worker)"""
+    ipf_map = _worker_state.map
+    return [decode_filename_from_local_header(ipf_map, offset) for offset in header_offsets]
+
+def _extract_batch(tasks, output_dir):
+    """Extract one batch of entries (runs in a worker)"""
+    return list(extract_entries(_worker_state.zip, _worker_state.map, tasks, output_dir,
+                                _worker_state.password))
+
+def split_extract_batches(tasks):
+    """
+    Group extraction tasks into worker batches of at most EXTRACT_BATCH_SIZE
+    entries or EXTRACT_BATCH_BYTES compressed bytes
+    A member over the byte limit gets a batch to itself, so the largest
+    entries run alongside the rest instead of stalling a full batch.
+    """
+    batch = []
+    batch_bytes = 0
+    for task in tasks:
+        compress_size = task[1].compress_size
+        if batch and batch_bytes + compress_size > EXTRACT_BATCH_BYTES:
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(task)
+        batch_bytes += compress_size
+        if len(batch) >= EXTRACT_BATCH_SIZE:
+            yield batch
+            batch = []
+            batch_bytes = 0
+    if batch:
+        yield batch
+
+def iter_extracted_entries(ipf_path, ipf_map, ipf_zip, file_infos, output_dir, password, max_workers=None):
+    """
+    Decrypt filenames, resolve output paths and extract every entry in one pass
+    Yields (index, decoded_filename, safe_filename, output_path, error,
+    fallback_error) as entries finish. On large archives the work streams
+    through worker processes: the next batch of filenames is decrypted while
+    the previous batches extract, so the phases overlap instead of running
+    back to back. Output names are resolved here, in archive order, so
+    workers never need to coordinate.
+    """
+    path_key = output_path_key(output_dir)
+    used_paths = {path_key(os.path.join(output_dir, name)) for name in os.listdir(output_dir)}
+    next_suffix = {}
+    entries = {}
+
+    def build_tasks(start, decoded_filenames):
+        tasks = []
+        for index, decoded_filename in enumerate(decoded_filenames, start):
+            safe_filename = make_safe_filename(decoded_filename) if decoded_filename else f"file_{index:04d}.bin"
+            output_path = resolve_output_path(output_dir, safe_filename, used_paths, next_suffix, path_key)
+            entries[index] = (decoded_filename, safe_filename, output_path)
+            tasks.append((index, file_infos[index], output_path))
+        # Names are settled in archive order above; the data is then read in
+        # file order, so each batch sweeps forward through the IPF even when
+        # the central directory lists entries out of layout order
+        tasks.sort(key=lambda task: task[1].header_offset)
+        return tasks
+
+    def finish(results):
+        for index, error, fallback_error in results:
+            yield (index,) + entries.pop(index) + (error, fallback_error)
+
+    name_batches = deque(
+        (start, [file_info.header_offset for file_info in file_infos[start:start + FILENAME_BATCH_SIZE]])
+        for start in range(0, len(file_infos), FILENAME_BATCH_SIZE)
+    )
+    max_workers = max_workers or min(os.cpu_count() or 1, MAX_AUTO_WORKERS)
+
+    if max_workers < 2 or len(file_infos) < PARALLEL_THRESHOLD:
+        for start, header_offsets in name_batches:
+            decoded_filenames = [decode_filename_from_local_header(ipf_map, offset) for offset in header_offsets]
+            tasks = build_tasks(start, decoded_filenames)
+            yield from finish(extract_entries(ipf_zip, ipf_map, tasks, output_dir, password))
+        return
+
+    executor_class = ThreadPoolExecutor if FREE_THREADED else ProcessPoolExecutor
+    with executor_class(max_workers=max_workers, initializer=_init_worker,
+                        initargs=(ipf_path, password)) as executor:
+        pending_names = deque()
+        pending_extracts = deque()
+
+        def submit_names():
+            if name_batches:
+                start, header_offsets = name_batches.popleft()
+                pending_names.append((start, executor.submit(_decode_filename_batch, header_offsets)))
+
+        # Keep filename batches queued ahead of the extraction batches
+        submit_names()
+        submit_names()
+        while pending_names:
+            start, future = pending_names.popleft()
+            tasks = build_tasks(start, future.result())
+            submit_names()
+
+            for batch in split_extract_batches(tasks):
+                # Backpressure: bound the number of queued extraction batches.
+                # Batches finish roughly in submission order, so waiting on
+                # the oldest is as good as waiting on whichever is first
+                if len(pending_extracts) >= 4 * max_workers:
+                    yield from finish(pending_extracts.popleft().result())
+                pending_extracts.append(executor.submit(_extract_batch, batch, output_dir))
+
+        while pending_extracts:
+            yield from finish(pending_extracts.popleft().result())
+
+def process_ipf_file(ipf_path, output_dir="extracted", verbose=False, max_workers=None):
     """
     Extract IPF file with proper filename decryption
     """
@@ -208,7 +580,7 @@ def process_ipf_file(ipf_path, output_dir="extracted", verbose=False):
     os.makedirs(output_dir, exist_ok=True)
 
     # Get the static IPF password
-    password = get_ipf_password()
+    password = _IPF_PASSWORD
     if verbose:
         print(f"Using static password: {password.hex()}")
 
@@ -217,98 +589,61 @@ def process_ipf_file(ipf_path, output_dir="extracted", verbose=False):
     last_log_time = start_time
 
     # Calculate smart logging intervals
-    def should_log_progress(current, total):
-        """Determine if we should log progress at this point"""
-        # Always log at designated percentage milestones
+    def progress_interval(total):
+        """Number of files between logged progress milestones"""
         if total < 1000:  # Small files: every 20%
-            return (current % max(100, int(total * 0.2)) == 0) or current == total
+            return max(100, int(total * 0.2))
         elif total < 10000:  # Medium files: every 10%
-            return (current % max(500, int(total * 0.1)) == 0) or current == total
+            return max(500, int(total * 0.1))
         else:  # Large files: every 5%
-            return (current % max(1000, int(total * 0.05)) == 0) or current == total
+            return max(1000, int(total * 0.05))
 
     try:
-        # Memory-efficient: Open file directly and let zipfile work with it
-        with open(ipf_path, 'rb') as file:
+        # Memory-efficient: Open file directly and let zipfile work with it,
+        # and map it once for the per-file local header reads
+        with open(ipf_path, 'rb') as file, map_ipf(file) as ipf_map:
             with zipfile.ZipFile(file) as ipf_zip:
                 file_infos = ipf_zip.infolist()
                 print(f"Found {len(file_infos)} files in archive")
 
-                for i, file_info in enumerate(file_infos):
-                    try:
-                        # Smart progress logging - based on file count and time
+                total = len(file_infos)
+                interval = progress_interval(total)
+                next_milestone = min(interval, total)
+                results = iter_extracted_entries(ipf_path, ipf_map, ipf_zip, file_infos,
+                                                 output_dir, password, max_workers)
+                for done, (index, decoded_filename, safe_filename, output_path,
+                           error, fallback_error) in enumerate(results, 1):
+                    # Smart progress logging - based on file count and time.
+                    # Milestones are one integer compare; the clock is only
+                    # read every PROGRESS_CLOCK_STRIDE files
+                    if not verbose and (done == next_milestone or
+                                      (done % PROGRESS_CLOCK_STRIDE == 0 and
+                                       time.time() - last_log_time >= 3.0)):
+                        if done == next_milestone:
+                            next_milestone = min(next_milestone + interval, total)
                         current_time = time.time()
-                        if not verbose and (should_log_progress(i + 1, len(file_infos)) or
-                                          current_time - last_log_time >= 3.0):
-                            elapsed = current_time - start_time
-                            rate = (i + 1) / elapsed if elapsed > 0 else 0
-                            eta = (len(file_infos) - i - 1) / rate if rate > 0 else 0
-                            percent = ((i + 1) / len(file_infos)) * 100
-                            sys.stdout.write(f"\rProgress: {i+1}/{len(file_infos)} "
-                                           f"({percent:.1f}%) - {rate:.0f} files/sec, ETA: {eta:.0f}s")
-                            sys.stdout.flush()
-                            last_log_time = current_time
-                        elif verbose:
-                            print(f"\n[{i+1}/{len(file_infos)}] Processing file...")
-
-                        # Try to decode filename from local header using streaming
-                        # Reopen file for filename reading (since zipfile position is advanced)
-                        with open(ipf_path, 'rb') as filename_file:
-                            decoded_filename = decode_filename_from_local_header(filename_file, file_info)
-                            if decoded_filename and verbose:
-                                print(f"Decoded filename: {decoded_filename}")
-                            safe_filename = make_safe_filename(decoded_filename) if decoded_filename else f"file_{i:04d}.bin"
-
-                            # Create full output path
-                            output_path = os.path.join(output_dir, safe_filename)
-
-                            # If file exists, add a number
-                            counter = 1
-                            base_path = output_path
-                            name, ext = os.path.splitext(base_path)
-                            while os.path.exists(output_path):
-                                output_path = f"{name}_{counter}{ext}"
-                                counter += 1
-
-                            # Extract the file using the static password with streaming
-                            if verbose:
-                                print(f"Extracting to: {output_path}")
-
-                            with ipf_zip.open(file_info, pwd=password) as member_file:
-                                with open(output_path, 'wb') as output_file:
-                                    # Stream the file in chunks to handle large files
-                                    buffer_size = 65536  # Larger buffer for better performance
-                                    while True:
-                                        chunk = member_file.read(buffer_size)
-                                        if not chunk:
-                                            break
-                                        output_file.write(chunk)
-
-                        if verbose:
-                            print(f"✓ Successfully extracted: {safe_filename} ({file_info.file_size} bytes)")
-
-                    except Exception as e:
-                        if verbose:
-                            print(f"✗ Failed to extract file: {e}")
-                        # Try fallback extraction with streaming
-                        try:
-                            fallback_name = f"fallback_{i:04d}.bin"
-                            fallback_path = os.path.join(output_dir, fallback_name)
-                            with ipf_zip.open(file_info, pwd=password) as member_file:
-                                with open(fallback_path, 'wb') as output_file:
-                                    # Stream with larger buffer for large files
-                                    buffer_size = 65536
-                                    while True:
-                                        chunk = member_file.read(buffer_size)
-                                        if not chunk:
-                                            break
-                                        output_file.write(chunk)
-                            if verbose:
-                                print(f"✓ Fallback extraction: {fallback_name}")
-                        except Exception as fallback_error:
-                            if verbose:
+                        elapsed = current_time - start_time
+                        rate = done / elapsed if elapsed > 0 else 0
+                        eta = (total - done) / rate if rate > 0 else 0
+                        percent = (done / total) * 100
+                        sys.stdout.write(f"\rProgress: {done}/{total} "
+                                       f"({percent:.1f}%) - {rate:.0f} files/sec, ETA: {eta:.0f}s")
+                        sys.stdout.flush()
+                        last_log_time = current_time
+                    elif verbose:
+                        print(f"\n[{index+1}/{total}] Processing file...")
+                        if decoded_filename:
+                            print(f"Decoded filename: {decoded_filename}")
+                        print(f"Extracting to: {output_path}")
+
+                        if error is None:
+                            print(f"✓ Successfully extracted: {safe_filename} ({file_infos[index].file_size} bytes)")
+                        else:
+                            print(f"✗ Failed to extract file: {error}")
+                            if fallback_error is None:
+                                print(f"✓ Fallback extraction: fallback_{index:04d}.bin")
+                            else:
                                 print(f"✗ Fallback also failed: {fallback_error}")
-                            continue
 
         # Final progress update
         elapsed = time.time() - start_time
@@ -323,16 +658,20 @@ def process_ipf_file(ipf_path, output_dir="extracted", verbose=False):
         print(f"\n✗ Failed to process IPF file: {e}")
         return False
 
+USAGE = "Usage: python ipf_extractor.py <file.ipf> [output_dir] [--verbose|-v] [--workers N]"
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python ipf_extractor.py <file.ipf> [output_dir] [--verbose|-v]")
+        print(USAGE)
         print("\nThis tool extracts IPF files with proper filename decryption.")
         print("Use --verbose or -v for detailed file-by-file logging")
+        print(f"Use --workers N to set the number of worker processes (default: auto-detect, up to {MAX_AUTO_WORKERS})")
         sys.exit(1)
 
     ipf_file = sys.argv[1]
     output_dir = "extracted"
     verbose = False
+    max_workers = None
 
     # Parse arguments
     i = 2
@@ -340,6 +679,17 @@ def main():
         arg = sys.argv[i]
         if arg in ['--verbose', '-v']:
             verbose = True
+        elif arg == '--workers':
+            try:
+                max_workers = int(sys.argv[i + 1])
+            except (IndexError, ValueError):
+                max_workers = -1
+            if max_workers < 0:
+                print("Error: --workers expects a non-negative number of processes")
+                print(USAGE)
+                sys.exit(1)
+            max_workers = max_workers or None
+            i += 1
         else:
             output_dir = arg
         i += 1
@@ -348,7 +698,7 @@ def main():
         print(f"Error: IPF file not found: '{ipf_file}'")
         sys.exit(1)
 
-    success = process_ipf_file(ipf_file, output_dir, verbose)
+    success = process_ipf_file(ipf_file, output_dir, verbose, max_workers)
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
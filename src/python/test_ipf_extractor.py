@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ipf_extractor
+
+
+class ResolveOutputPathTest(unittest.TestCase):
+    def test_names_differing_only_by_case_collide_on_case_insensitive_filesystems(self):
+        used_paths, next_suffix = set(), {}
+        key = ipf_extractor._casefold_path
+        first = ipf_extractor.resolve_output_path('out', 'Icon.tga', used_paths, next_suffix, key)
+        second = ipf_extractor.resolve_output_path('out', 'icon.tga', used_paths, next_suffix, key)
+        self.assertEqual(first, os.path.join('out', 'Icon.tga'))
+        self.assertEqual(second, os.path.join('out', 'icon_1.tga'))
+
+    def test_names_differing_only_by_case_stay_apart_on_case_sensitive_filesystems(self):
+        used_paths, next_suffix = set(), {}
+        key = lambda path: path
+        ipf_extractor.resolve_output_path('out', 'Icon.tga', used_paths, next_suffix, key)
+        second = ipf_extractor.resolve_output_path('out', 'icon.tga', used_paths, next_suffix, key)
+        self.assertEqual(second, os.path.join('out', 'icon.tga'))
+
+    def test_resumed_suffix_search_matches_counting_from_one_when_case_folded(self):
+        names = ['Icon.tga', 'icon.tga', 'icon_1.tga', 'ICON.TGA', 'Icon_3.TGA', 'icon.TGA']
+        key = ipf_extractor._casefold_path
+
+        used_paths, next_suffix = set(), {}
+        resumed = [ipf_extractor.resolve_output_path('out', name, used_paths, next_suffix, key)
+                   for name in names]
+
+        # Same search without the remembered suffixes
+        used_paths = set()
+        counted = [ipf_extractor.resolve_output_path('out', name, used_paths, {}, key)
+                   for name in names]
+
+        self.assertEqual(resumed, counted)
+        self.assertEqual(len({key(path) for path in resumed}), len(names))
+
+
+class OutputPathKeyTest(unittest.TestCase):
+    def test_key_matches_how_the_filesystem_treats_case(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            open(os.path.join(output_dir, 'icon.tga'), 'wb').close()
+            key = ipf_extractor.output_path_key(output_dir)
+            upper_exists = os.path.exists(os.path.join(output_dir, 'ICON.TGA'))
+            same_key = key(os.path.join(output_dir, 'ICON.TGA')) == key(os.path.join(output_dir, 'icon.tga'))
+            self.assertEqual(same_key, upper_exists)
+
+    def test_probe_leaves_nothing_behind(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            ipf_extractor.output_path_key(output_dir)
+            self.assertEqual(os.listdir(output_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,8 +14,10 @@ const path = require('path');
 async function analyzeDirectory(dirPath) {
     const files = scanDirectory(dirPath);
     const fileCount = files.length;
-    const totalSize = calculateTotalSize(files);
-    const structure = buildManifest(dirPath, files);
+    // Stat each file once and share the sizes between both passes
+    const sizes = statFileSizes(files);
+    const totalSize = calculateTotalSize(files, sizes);
+    const structure = buildManifest(dirPath, files, sizes);
 
     return {
         file_count: fileCount,
@@ -35,20 +37,31 @@ function countFiles(dirPath) {
 }
 
 /**
- * Calculate total size of all files
+ * Stat every file and collect its size
  * @param {Array<string>} files - List of file paths
- * @returns {number} - Total size in bytes
+ * @returns {Array<number>} - Sizes in bytes, in the same order as files
  */
-function calculateTotalSize(files) {
-    let totalSize = 0;
-
-    for (const filePath of files) {
+function statFileSizes(files) {
+    return files.map(filePath => {
         try {
-            const stat = fs.statSync(filePath);
-            totalSize += stat.size;
+            return fs.statSync(filePath).size;
         } catch (error) {
             throw new Error(`Failed to stat ${filePath}: ${error.message}`);
         }
+    });
+}
+
+/**
+ * Calculate total size of all files
+ * @param {Array<string>} files - List of file paths
+ * @param {Array<number>} [sizes] - Sizes already collected for files
+ * @returns {number} - Total size in bytes
+ */
+function calculateTotalSize(files, sizes = statFileSizes(files)) {
+    let totalSize = 0;
+
+    for (const size of sizes) {
+        totalSize += size;
     }
 
     return totalSize;
@@ -57,33 +70,30 @@ function calculateTotalSize(files) {
 /**
  * Build manifest of directory structure
  * @param {string} dirPath - Directory path
- * @param {Array<string>} files - List of file paths
+ * @param {Array<string>} files - List of file paths (scanDirectory only returns files)
+ * @param {Array<number>} [sizes] - Sizes already collected for files
  * @returns {Object} - Directory structure
  */
-function buildManifest(dirPath, files) {
+function buildManifest(dirPath, files, sizes = statFileSizes(files)) {
     const manifest = {};
 
-    for (const filePath of files) {
+    files.forEach((filePath, index) => {
         const relPath = path.relative(dirPath, filePath);
-        const stat = fs.statSync(filePath);
+        const parts = relPath.split(path.sep);
+        let current = manifest;
 
-        if (stat.isFile()) {
-            const parts = relPath.split(path.sep);
-            let current = manifest;
-
-            for (let i = 0; i < parts.length - 1; i++) {
-                if (!current[parts[i]]) {
-                    current[parts[i]] = {};
-                }
-                current = current[parts[i]];
+        for (let i = 0; i < parts.length - 1; i++) {
+            if (!current[parts[i]]) {
+                current[parts[i]] = {};
             }
-
-            current[parts[parts.length - 1]] = {
-                type: 'file',
-                size: stat.size
-            };
+            current = current[parts[i]];
         }
-    }
+
+        current[parts[parts.length - 1]] = {
+            type: 'file',
+            size: sizes[index]
+        };
+    });
 
     return manifest;
 }
@@ -113,15 +123,17 @@ function scanDirectory(dirPath) {
     const files = [];
 
     function scan(currentPath) {
-        const items = fs.readdirSync(currentPath);
+        // Dirents carry the type from the directory read itself, so only
+        // symlinks need a stat to see what they point to
+        const entries = fs.readdirSync(currentPath, { withFileTypes: true });
 
-        for (const item of items) {
-            const fullPath = path.join(currentPath, item);
-            const stat = fs.statSync(fullPath);
+        for (const dirent of entries) {
+            const fullPath = path.join(currentPath, dirent.name);
+            const entry = dirent.isSymbolicLink() ? fs.statSync(fullPath) : dirent;
 
-            if (stat.isDirectory()) {
+            if (entry.isDirectory()) {
                 scan(fullPath);
-            } else if (stat.isFile()) {
+            } else if (entry.isFile()) {
                 files.push(fullPath);
             }
         }
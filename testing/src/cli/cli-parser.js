@@ -47,6 +47,9 @@ class CliParser {
             }
         }
 
+        // Commands read --keep as options.keep
+        parsed.keep = parsed.options.keep === true;
+
         this.options = parsed.options;
         this.command = parsed.command;
 
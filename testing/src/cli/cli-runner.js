@@ -6,20 +6,35 @@
 const CliParser = require('./cli-parser');
 const Logger = require('../logger');
 const config = require('../config');
+const { cleanup } = require('../filesystem');
 
 const logger = new Logger(config.LOG_LEVEL, config.LOG_SINK, config.LOG_FILE);
 
 class CliRunner {
     constructor() {
+        // Modules are loaded on dispatch, so a run only pays for the
+        // command it executes and --help loads none of them
         this.commands = {
-            generate: require('./commands/generate.js'),
-            test: require('./commands/test.js'),
-            'test-extraction': require('./commands/test-extraction.js'),
-            'test-optimization': require('./commands/test-optimization.js'),
-            'test-creation': require('./commands/test-creation.js')
+            generate: './commands/generate.js',
+            test: './commands/test.js',
+            'test-extraction': './commands/test-extraction.js',
+            'test-optimization': './commands/test-optimization.js',
+            'test-creation': './commands/test-creation.js'
         };
     }
 
+    /**
+     * Load the module for a command
+     * @param {string} command - Command name
+     * @returns {Object|null} - Command module, or null if unknown
+     */
+    getCommand(command) {
+        if (!Object.prototype.hasOwnProperty.call(this.commands, command)) {
+            return null;
+        }
+        return require(this.commands[command]);
+    }
+
     /**
      * Run CLI with given arguments
      * @param {Array<string>} args - CLI arguments
@@ -30,8 +45,9 @@ class CliRunner {
         const parsed = parser.parse(args);
 
         if (parsed.showHelp) {
-            if (parsed.command && this.commands[parsed.command]?.showHelp) {
-                console.log(this.commands[parsed.command].showHelp());
+            const commandHandler = parsed.command && this.getCommand(parsed.command);
+            if (commandHandler?.showHelp) {
+                console.log(commandHandler.showHelp());
             } else {
                 console.log(parser.showGeneralHelp());
             }
@@ -44,19 +60,42 @@ class CliRunner {
             return 1;
         }
 
-        const commandHandler = this.commands[parsed.command];
+        const commandHandler = this.getCommand(parsed.command);
         if (!commandHandler) {
             logger.error(`Unknown command: ${parsed.command}`);
             console.log(parser.showGeneralHelp());
             return 1;
         }
 
+        if (config.TEST_JOBS === null) {
+            logger.error('--jobs expects a positive number of test files');
+            console.log(commandHandler.showHelp ? commandHandler.showHelp() : parser.showGeneralHelp());
+            return 1;
+        }
+
         try {
             const exitCode = await commandHandler.execute(parsed);
             return exitCode;
         } catch (error) {
             logger.error(`Command failed: ${error.message}`);
             return 1;
+        } finally {
+            this.finishTempDir(parsed.keep);
+        }
+    }
+
+    /**
+     * Remove the run's temp directory, or report where it is with --keep
+     * @param {boolean} keep - Whether to keep tool output
+     */
+    finishTempDir(keep) {
+        if (!config.TEMP_DIR_CREATED) {
+            return;
+        }
+        if (keep) {
+            logger.info(`Tool output kept in: ${config.TEMP_DIR}`);
+        } else {
+            cleanup(config.TEMP_DIR);
         }
     }
 
@@ -26,7 +26,50 @@ function formatError(error, command) {
     return `${command} failed: ${message}`;
 }
 
+/**
+ * Run an async function over items with at most `limit` calls in flight
+ * @param {Array} items - Items to process
+ * @param {number} limit - Maximum concurrent calls (1 runs serially)
+ * @param {Function} fn - Async function called with (item, index)
+ * @returns {Promise<Array>} - Results in the same order as items
+ */
+async function mapWithConcurrency(items, limit, fn) {
+    const results = new Array(items.length);
+    let next = 0;
+
+    async function worker() {
+        while (next < items.length) {
+            const index = next++;
+            results[index] = await fn(items[index], index);
+        }
+    }
+
+    const workerCount = Math.max(1, Math.min(limit, items.length));
+    await Promise.all(Array.from({ length: workerCount }, worker));
+    return results;
+}
+
+/**
+ * Summarize per-file test results in a single pass
+ * @param {Object} testFiles - Map of test key to result
+ * @returns {{totalTests: number, perfectMatches: number, successRate: number}} - Summary counts
+ */
+function summarizeResults(testFiles) {
+    let totalTests = 0;
+    let perfectMatches = 0;
+
+    for (const key in testFiles) {
+        totalTests++;
+        if (testFiles[key].perfect_match) perfectMatches++;
+    }
+
+    const successRate = totalTests > 0 ? (perfectMatches / totalTests) : 0;
+    return { totalTests, perfectMatches, successRate };
+}
+
 module.exports = {
     getExitCode,
-    formatError
+    formatError,
+    mapWithConcurrency,
+    summarizeResults
 };
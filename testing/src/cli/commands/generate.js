@@ -1,6 +1,6 @@
 #!/usr/bin/env node
 
-const { writeJson, cleanup } = require('../../filesystem');
+const { writeJson } = require('../../filesystem');
 const Logger = require('../../logger');
 const config = require('../../config');
 
@@ -59,8 +59,6 @@ async function generateAll(options) {
 
     printSummary(counts);
 
-    cleanup(config.TEMP_DIR);
-
     const totalFailed = Object.values(counts).reduce((sum, c) => sum + c.failed, 0);
     return totalFailed === 0 ? 0 : 1;
 }
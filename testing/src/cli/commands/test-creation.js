@@ -1,11 +1,13 @@
 #!/usr/bin/env node
 
-const { executeCommand } = require('../../executor');
+const { executeCommand, STDERR_ONLY } = require('../../executor');
 const { calculateDirectoryHash } = require('../../hashing/hash-calculator');
+const { compareHashes } = require('../../hashing/hash-comparator');
 const { fileExists, ensureDir, removeDir, writeJson, readJson, removeFile, cleanup } = require('../../filesystem');
 const path = require('path');
 const Logger = require('../../logger');
 const config = require('../../config');
+const { mapWithConcurrency, summarizeResults } = require('../command-utils');
 const { formatBytes } = require('../../generators/base');
 
 const logger = new Logger(config.LOG_LEVEL, config.LOG_SINK, config.LOG_FILE);
@@ -27,151 +29,152 @@ async function execute(options) {
         return 1;
     }
 
+    // One stamp for the run; per-test timestamps below still record when
+    // each test finished, which matters now that tests overlap
+    const runStartedAt = new Date().toISOString();
+
     const ourHashes = {
-        generated_at: new Date().toISOString(),
+        generated_at: runStartedAt,
         purpose: 'Hashes from our ipf-creator tool',
         tool: 'ipf-creator (Go implementation)',
         test_files: {}
     };
 
-    const results = { test_run_at: new Date().toISOString(), test_files: {} };
+    const results = { test_run_at: runStartedAt, test_files: {} };
 
     const creationTests = Object.entries(config.TEST_FILES)
         .filter(([key, fileConfig]) => fileConfig.type === 'creation');
 
-    for (const [key, fileConfig] of creationTests) {
-        logger.info(`\n--- Testing ${fileConfig.name} (${key}) ---`);
-
-        if (!fileExists(fileConfig.source)) {
-            logger.error(`Source IPF not found: ${fileConfig.source}`);
-            results.test_files[key] = { test_file: fileConfig.name, status: 'skipped', error: 'Source IPF not found', timestamp: new Date().toISOString() };
-            continue;
-        }
-
-        const tempDir = path.join(config.TEMP_DIR, `test_creation_${key}`);
-        const sourceFolder = path.join(tempDir, 'source');
-        const tempIpf = path.join(tempDir, 'created.ipf');
-        const extractDir = path.join(tempDir, 'extracted');
-
-        try {
-            cleanup(tempDir);
-            ensureDir(sourceFolder);
-
-            logger.info('Extracting source IPF to get source folder...');
-            const preExtractResult = await executeCommand(
-                config.EXTRACTOR_PATH,
-                ['-input', fileConfig.source, '-output', sourceFolder],
-                config.EXECUTION_TIMEOUT
-            );
+    const outcomes = await mapWithConcurrency(creationTests, config.TEST_JOBS,
+        ([key, fileConfig]) => runCreationTest(key, fileConfig, originalHashes, options));
 
-            if (!preExtractResult.success) {
-                throw new Error(`Pre-extraction failed: ${preExtractResult.error || preExtractResult.stderr}`);
-            }
+    // Record in test order regardless of which run finished first
+    creationTests.forEach(([key], i) => {
+        const { result, ourHash } = outcomes[i];
+        if (ourHash) ourHashes.test_files[key] = ourHash;
+        results.test_files[key] = result;
+    });
 
-            logger.info('Creating IPF with our tool...');
-            const startTime = Date.now();
-            const createResult = await executeCommand(
-                config.CREATOR_PATH,
-                ['-folder', sourceFolder, '-output', tempIpf],
-                config.EXECUTION_TIMEOUT
-            );
-            const elapsed = ((Date.now() - startTime) / 1000).toFixed(2);
-
-            if (!createResult.success) {
-                throw new Error(createResult.error || createResult.stderr || 'Unknown error');
-            }
+    await writeJson(config.CREATION_OUR_HASHES_PATH, ourHashes, 2);
+    logger.info(`Our hashes saved to: ${config.CREATION_OUR_HASHES_PATH}`);
 
-            if (!fileExists(tempIpf)) {
-                throw new Error('ipf-creator did not create expected IPF file');
-            }
+    const { totalTests, perfectMatches, successRate } = summarizeResults(results.test_files);
 
-            logger.success(`IPF creation completed in ${elapsed}s`);
+    logger.info('\n=== Test Summary ===');
+    logger.info(`Total test files: ${totalTests}`);
+    logger.info(`Perfect matches: ${perfectMatches}`);
+    logger.info(`Success rate: ${(successRate * 100).toFixed(1)}%`);
 
-            logger.info('Extracting created IPF with our extractor...');
-            ensureDir(extractDir);
-            
-            const extractResult = await executeCommand(
-                config.EXTRACTOR_PATH,
-                ['-input', tempIpf, '-output', extractDir],
-                config.EXECUTION_TIMEOUT
-            );
+    return successRate === 1 ? 0 : 1;
+}
 
-            if (!extractResult.success) {
-                throw new Error(`Extraction failed: ${extractResult.error || extractResult.stderr}`);
-            }
+/**
+ * Create an IPF from one test file's contents with our tool and compare its
+ * extracted contents with the reference
+ * @param {string} key - Test file key
+ * @param {Object} fileConfig - Test file configuration
+ * @param {Object} originalHashes - Reference hash database
+ * @param {Object} options - Command options
+ * @returns {Promise<{result: Object, ourHash: Object|undefined}>} - Test result and our hash entry
+ */
+async function runCreationTest(key, fileConfig, originalHashes, options) {
+    logger.info(`\n--- Testing ${fileConfig.name} (${key}) ---`);
+
+    if (!fileExists(fileConfig.source)) {
+        logger.error(`Source IPF not found: ${fileConfig.source}`);
+        return { result: { test_file: fileConfig.name, status: 'skipped', error: 'Source IPF not found', timestamp: new Date().toISOString() } };
+    }
 
-            logger.success('Extraction completed');
+    // Without reference data the run can't pass, so don't spend minutes
+    // extracting, creating and re-extracting for it
+    const referenceData = originalHashes.test_files[key]?.extracted_files;
+    if (!referenceData) {
+        logger.error(`No reference data for ${key}`);
+        return { result: { test_file: fileConfig.name, status: 'no_reference', error: 'No reference data available', timestamp: new Date().toISOString() } };
+    }
 
-            logger.info('Generating hashes from extracted contents...');
-            const ourHash = await calculateDirectoryHash(extractDir);
-            ourHashes.test_files[key] = { test_file: fileConfig.name, extracted_files: ourHash, timestamp: new Date().toISOString() };
+    const tempDir = path.join(config.TEMP_DIR, `test_creation_${key}`);
+    const sourceFolder = path.join(tempDir, 'source');
+    const tempIpf = path.join(tempDir, 'created.ipf');
+    const extractDir = path.join(tempDir, 'extracted');
+    let ourHash;
 
-            logger.info('Comparing with reference extracted hashes...');
-            const referenceData = originalHashes.test_files[key]?.extracted_files;
-            if (!referenceData) {
-                logger.error(`No reference data for ${key}`);
-                results.test_files[key] = { test_file: fileConfig.name, status: 'no_reference', error: 'No reference data available', timestamp: new Date().toISOString() };
-                if (!options.keep) cleanup(tempDir);
-                continue;
-            }
-
-            const comparison = compareHashes(ourHash, referenceData);
-            results.test_files[key] = { test_file: fileConfig.name, status: 'complete', perfect_match: comparison.perfectMatch, ...comparison.details, timestamp: new Date().toISOString() };
+    try {
+        cleanup(tempDir);
+        ensureDir(sourceFolder);
+
+        logger.info(`${key}: Extracting source IPF to get source folder...`);
+        const preExtractResult = await executeCommand(
+            config.EXTRACTOR_PATH,
+            ['-input', fileConfig.source, '-output', sourceFolder],
+            config.EXECUTION_TIMEOUT,
+            STDERR_ONLY
+        );
+
+        if (!preExtractResult.success) {
+            throw new Error(`Pre-extraction failed: ${preExtractResult.error || preExtractResult.stderr}`);
+        }
 
-            if (comparison.perfectMatch) {
-                logger.success(`${key}: Perfect match!`);
-            } else {
-                logger.error(`${key}: Extracted contents do not match`);
-                if (comparison.details.mismatches) {
-                    logger.verbose(`Mismatches: ${comparison.details.mismatches.length} files`);
-                }
-            }
+        logger.info(`${key}: Creating IPF with our tool...`);
+        const startTime = Date.now();
+        const createResult = await executeCommand(
+            config.CREATOR_PATH,
+            ['-folder', sourceFolder, '-output', tempIpf],
+            config.EXECUTION_TIMEOUT,
+            STDERR_ONLY
+        );
+        const elapsed = ((Date.now() - startTime) / 1000).toFixed(2);
+
+        if (!createResult.success) {
+            throw new Error(createResult.error || createResult.stderr || 'Unknown error');
+        }
 
-            if (!options.keep) cleanup(tempDir);
-        } catch (error) {
-            logger.error(`Test failed: ${error.message}`);
-            results.test_files[key] = { test_file: fileConfig.name, status: 'failed', error: error.message, timestamp: new Date().toISOString() };
-            cleanup(tempDir);
+        if (!fileExists(tempIpf)) {
+            throw new Error('ipf-creator did not create expected IPF file');
         }
-    }
 
-    await writeJson(config.CREATION_OUR_HASHES_PATH, ourHashes, 2);
-    logger.info(`Our hashes saved to: ${config.CREATION_OUR_HASHES_PATH}`);
+        logger.success(`${key}: IPF creation completed in ${elapsed}s`);
 
-    const totalTests = Object.keys(results.test_files).length;
-    const perfectMatches = Object.values(results.test_files).filter(t => t.perfect_match).length;
-    const successRate = totalTests > 0 ? (perfectMatches / totalTests) : 0;
+        logger.info(`${key}: Extracting created IPF with our extractor...`);
+        ensureDir(extractDir);
+        
+        const extractResult = await executeCommand(
+            config.EXTRACTOR_PATH,
+            ['-input', tempIpf, '-output', extractDir],
+            config.EXECUTION_TIMEOUT,
+            STDERR_ONLY
+        );
 
-    logger.info('\n=== Test Summary ===');
-    logger.info(`Total test files: ${totalTests}`);
-    logger.info(`Perfect matches: ${perfectMatches}`);
-    logger.info(`Success rate: ${(successRate * 100).toFixed(1)}%`);
+        if (!extractResult.success) {
+            throw new Error(`Extraction failed: ${extractResult.error || extractResult.stderr}`);
+        }
 
-    return successRate === 1 ? 0 : 1;
-}
+        logger.success(`${key}: Extraction completed`);
 
-function compareHashes(ourHash, referenceHash) {
-    const details = {
-        file_count_match: ourHash.file_count === referenceHash.file_count,
-        total_size_match: ourHash.total_size === referenceHash.total_size,
-        mismatches: []
-    };
+        logger.info(`${key}: Generating hashes from extracted contents...`);
+        const directoryHash = await calculateDirectoryHash(extractDir);
+        ourHash = { test_file: fileConfig.name, extracted_files: directoryHash, timestamp: new Date().toISOString() };
 
-    const filesToCompare = ourHash.strategy === 'full' ? ourHash.files : ourHash.sampled_files;
-    const referenceFiles = referenceHash.strategy === 'full' ? referenceHash.files : referenceHash.sampled_files;
+        logger.info(`${key}: Comparing with reference extracted hashes...`);
+        const comparison = compareHashes(directoryHash, referenceData);
+        const result = { test_file: fileConfig.name, status: 'complete', perfect_match: comparison.perfectMatch, ...comparison.details, timestamp: new Date().toISOString() };
 
-    for (const [filename, fileData] of Object.entries(filesToCompare)) {
-        const refFile = referenceFiles[filename];
-        if (!refFile) { details.mismatches.push(`${filename}: Missing in reference`); continue; }
-        if (fileData.hash !== refFile.hash) details.mismatches.push(`${filename}: Hash mismatch`);
-        if (fileData.size !== refFile.size) details.mismatches.push(`${filename}: Size mismatch`);
-    }
+        if (comparison.perfectMatch) {
+            logger.success(`${key}: Perfect match!`);
+        } else {
+            logger.error(`${key}: Extracted contents do not match`);
+            if (comparison.details.mismatches) {
+                logger.verbose(`${key}: Mismatches: ${comparison.details.mismatches.length} files`);
+            }
+        }
 
-    for (const filename of Object.keys(referenceFiles)) {
-        if (!filesToCompare[filename]) details.mismatches.push(`${filename}: Missing in our output`);
+        if (!options.keep) cleanup(tempDir);
+        return { result, ourHash };
+    } catch (error) {
+        logger.error(`${key}: Test failed: ${error.message}`);
+        cleanup(tempDir);
+        return { result: { test_file: fileConfig.name, status: 'failed', error: error.message, timestamp: new Date().toISOString() }, ourHash };
     }
-
-    return { perfectMatch: details.mismatches.length === 0 && details.file_count_match && details.total_size_match, details };
 }
 
 function showHelp() {
@@ -196,6 +199,7 @@ Prerequisites:
 Options:
     --verbose, -v      Enable detailed output
     --keep              Keep temp files for debugging
+    --jobs <n>          Run at most n test files at once (default: all)
     --help, -h         Show this help message
 
 Test Files:
@@ -1,7 +1,9 @@
 #!/usr/bin/env node
 
-const { executeCommand } = require('../../executor');
+const { executeCommand, STDERR_ONLY } = require('../../executor');
 const { calculateDirectoryHash } = require('../../hashing/hash-calculator');
+const { compareHashes } = require('../../hashing/hash-comparator');
+const { mapWithConcurrency, summarizeResults } = require('../command-utils');
 const { fileExists, ensureDir, removeDir, writeJson, readJson, cleanup } = require('../../filesystem');
 const path = require('path');
 const Logger = require('../../logger');
@@ -26,87 +28,36 @@ async function execute(options) {
         return 1;
     }
 
+    // One stamp for the run; per-test timestamps below still record when
+    // each test finished, which matters now that tests overlap
+    const runStartedAt = new Date().toISOString();
+
     const ourHashes = {
-        generated_at: new Date().toISOString(),
+        generated_at: runStartedAt,
         purpose: 'Hashes from our Go IPF extractor',
         tool: 'ipf-extractor (Go implementation)',
         test_files: {}
     };
 
-    const results = { test_run_at: new Date().toISOString(), test_files: {} };
+    const results = { test_run_at: runStartedAt, test_files: {} };
 
     const extractionTests = Object.entries(config.TEST_FILES)
         .filter(([key, fileConfig]) => fileConfig.type === 'extraction');
 
-    for (const [key, fileConfig] of extractionTests) {
-        logger.info(`\n--- Testing ${fileConfig.name} (${key}) ---`);
-
-        if (!fileExists(fileConfig.source)) {
-            logger.error(`Source IPF not found: ${fileConfig.source}`);
-            results.test_files[key] = { test_file: fileConfig.name, status: 'skipped', error: 'Source IPF not found', timestamp: new Date().toISOString() };
-            continue;
-        }
-
-        const tempDir = path.join(config.TEMP_DIR, `test_extraction_${key}`);
-
-        try {
-            cleanup(tempDir);
-            ensureDir(tempDir);
-
-            logger.info('Extracting with our tool...');
-            const startTime = Date.now();
-            const result = await executeCommand(
-                config.EXTRACTOR_PATH,
-                ['-input', fileConfig.source, '-output', tempDir],
-                config.EXECUTION_TIMEOUT
-            );
-            const elapsed = ((Date.now() - startTime) / 1000).toFixed(2);
-
-            if (!result.success) {
-                throw new Error(result.error || result.stderr || 'Unknown error');
-            }
-
-            logger.success(`Extraction completed in ${elapsed}s`);
-
-            logger.info('Generating hashes from our output...');
-            const ourHash = await calculateDirectoryHash(tempDir);
-            ourHashes.test_files[key] = { test_file: fileConfig.name, extracted_files: ourHash, timestamp: new Date().toISOString() };
-
-            logger.info('Comparing with original reference hashes...');
-            const referenceData = originalHashes.test_files[key]?.extracted_files;
-            if (!referenceData) {
-                logger.error(`No reference data for ${key}`);
-                results.test_files[key] = { test_file: fileConfig.name, status: 'no_reference', error: 'No reference data available', timestamp: new Date().toISOString() };
-                if (!options.keep) cleanup(tempDir);
-                continue;
-            }
-
-            const comparison = compareHashes(ourHash, referenceData);
-            results.test_files[key] = { test_file: fileConfig.name, status: 'complete', perfect_match: comparison.perfectMatch, ...comparison.details, timestamp: new Date().toISOString() };
-
-            if (comparison.perfectMatch) {
-                logger.success(`${key}: Perfect match!`);
-            } else {
-                logger.error(`${key}: Files do not match`);
-                if (comparison.details.mismatches) {
-                    logger.verbose(`Mismatches: ${comparison.details.mismatches.length} files`);
-                }
-            }
+    const outcomes = await mapWithConcurrency(extractionTests, config.TEST_JOBS,
+        ([key, fileConfig]) => runExtractionTest(key, fileConfig, originalHashes, options));
 
-            if (!options.keep) cleanup(tempDir);
-        } catch (error) {
-            logger.error(`Extraction failed: ${error.message}`);
-            results.test_files[key] = { test_file: fileConfig.name, status: 'extraction_failed', error: error.message, timestamp: new Date().toISOString() };
-            cleanup(tempDir);
-        }
-    }
+    // Record in test order regardless of which run finished first
+    extractionTests.forEach(([key], i) => {
+        const { result, ourHash } = outcomes[i];
+        if (ourHash) ourHashes.test_files[key] = ourHash;
+        results.test_files[key] = result;
+    });
 
     await writeJson(config.EXTRACTION_OUR_HASHES_PATH, ourHashes, 2);
     logger.info(`Our hashes saved to: ${config.EXTRACTION_OUR_HASHES_PATH}`);
 
-    const totalTests = Object.keys(results.test_files).length;
-    const perfectMatches = Object.values(results.test_files).filter(t => t.perfect_match).length;
-    const successRate = totalTests > 0 ? (perfectMatches / totalTests) : 0;
+    const { totalTests, perfectMatches, successRate } = summarizeResults(results.test_files);
 
     logger.info('\n=== Test Summary ===');
     logger.info(`Total test files: ${totalTests}`);
@@ -116,28 +67,76 @@ async function execute(options) {
     return successRate === 1 ? 0 : 1;
 }
 
-function compareHashes(ourHash, referenceHash) {
-    const details = {
-        file_count_match: ourHash.file_count === referenceHash.file_count,
-        total_size_match: ourHash.total_size === referenceHash.total_size,
-        mismatches: []
-    };
-
-    const filesToCompare = ourHash.strategy === 'full' ? ourHash.files : ourHash.sampled_files;
-    const referenceFiles = referenceHash.strategy === 'full' ? referenceHash.files : referenceHash.sampled_files;
-
-    for (const [filename, fileData] of Object.entries(filesToCompare)) {
-        const refFile = referenceFiles[filename];
-        if (!refFile) { details.mismatches.push(`${filename}: Missing in reference`); continue; }
-        if (fileData.hash !== refFile.hash) details.mismatches.push(`${filename}: Hash mismatch`);
-        if (fileData.size !== refFile.size) details.mismatches.push(`${filename}: Size mismatch`);
+/**
+ * Extract one test IPF with our tool and compare it with the reference
+ * @param {string} key - Test file key
+ * @param {Object} fileConfig - Test file configuration
+ * @param {Object} originalHashes - Reference hash database
+ * @param {Object} options - Command options
+ * @returns {Promise<{result: Object, ourHash: Object|undefined}>} - Test result and our hash entry
+ */
+async function runExtractionTest(key, fileConfig, originalHashes, options) {
+    logger.info(`\n--- Testing ${fileConfig.name} (${key}) ---`);
+
+    if (!fileExists(fileConfig.source)) {
+        logger.error(`Source IPF not found: ${fileConfig.source}`);
+        return { result: { test_file: fileConfig.name, status: 'skipped', error: 'Source IPF not found', timestamp: new Date().toISOString() } };
     }
 
-    for (const filename of Object.keys(referenceFiles)) {
-        if (!filesToCompare[filename]) details.mismatches.push(`${filename}: Missing in our output`);
+    // Without reference data the run can't pass, so don't spend minutes
+    // extracting and hashing for it
+    const referenceData = originalHashes.test_files[key]?.extracted_files;
+    if (!referenceData) {
+        logger.error(`No reference data for ${key}`);
+        return { result: { test_file: fileConfig.name, status: 'no_reference', error: 'No reference data available', timestamp: new Date().toISOString() } };
     }
 
-    return { perfectMatch: details.mismatches.length === 0 && details.file_count_match && details.total_size_match, details };
+    const tempDir = path.join(config.TEMP_DIR, `test_extraction_${key}`);
+    let ourHash;
+
+    try {
+        cleanup(tempDir);
+        ensureDir(tempDir);
+
+        logger.info(`${key}: Extracting with our tool...`);
+        const startTime = Date.now();
+        const result = await executeCommand(
+            config.EXTRACTOR_PATH,
+            ['-input', fileConfig.source, '-output', tempDir],
+            config.EXECUTION_TIMEOUT,
+            STDERR_ONLY
+        );
+        const elapsed = ((Date.now() - startTime) / 1000).toFixed(2);
+
+        if (!result.success) {
+            throw new Error(result.error || result.stderr || 'Unknown error');
+        }
+
+        logger.success(`${key}: Extraction completed in ${elapsed}s`);
+
+        logger.info(`${key}: Generating hashes from our output...`);
+        const directoryHash = await calculateDirectoryHash(tempDir);
+        ourHash = { test_file: fileConfig.name, extracted_files: directoryHash, timestamp: new Date().toISOString() };
+
+        logger.info(`${key}: Comparing with original reference hashes...`);
+        const comparison = compareHashes(directoryHash, referenceData);
+
+        if (comparison.perfectMatch) {
+            logger.success(`${key}: Perfect match!`);
+        } else {
+            logger.error(`${key}: Files do not match`);
+            if (comparison.details.mismatches) {
+                logger.verbose(`${key}: Mismatches: ${comparison.details.mismatches.length} files`);
+            }
+        }
+
+        if (!options.keep) cleanup(tempDir);
+        return { result: { test_file: fileConfig.name, status: 'complete', perfect_match: comparison.perfectMatch, ...comparison.details, timestamp: new Date().toISOString() }, ourHash };
+    } catch (error) {
+        logger.error(`${key}: Extraction failed: ${error.message}`);
+        cleanup(tempDir);
+        return { result: { test_file: fileConfig.name, status: 'extraction_failed', error: error.message, timestamp: new Date().toISOString() }, ourHash };
+    }
 }
 
 function showHelp() {
@@ -161,6 +160,8 @@ Prerequisites:
 Options:
     --verbose, -v      Enable detailed output
     --keep              Keep extracted files for debugging
+    --jobs <n>          Run at most n test files at once (default: all)
+    --temp-dir <path>   Where to create the run's output dir (default: system temp dir)
     --help, -h         Show this help message
 
 Test Files:
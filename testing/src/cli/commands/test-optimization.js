@@ -1,11 +1,12 @@
 #!/usr/bin/env node
 
-const { executeCommand } = require('../../executor');
-const { ensureDir, removeDir, fileExists, getFileInfo, copyFile, writeJson, readJson, cleanup } = require('../../filesystem');
-const { calculateFileHash } = require('../../hash');
+const { executeCommand, STDERR_ONLY } = require('../../executor');
+const { ensureDir, removeDir, fileExists, copyFile, writeJson, readJson, cleanup } = require('../../filesystem');
+const { hashFile } = require('../../hash');
 const path = require('path');
 const Logger = require('../../logger');
 const config = require('../../config');
+const { mapWithConcurrency, summarizeResults } = require('../command-utils');
 const { countIPFFiles } = require('../../count-ipf-files');
 const { formatBytes } = require('../../generators/base');
 
@@ -28,107 +29,36 @@ async function execute(options) {
         return 1;
     }
 
+    // One stamp for the run; per-test timestamps below still record when
+    // each test finished, which matters now that tests overlap
+    const runStartedAt = new Date().toISOString();
+
     const ourHashes = {
-        generated_at: new Date().toISOString(),
+        generated_at: runStartedAt,
         purpose: 'Hashes from our ipf-optimizer tool',
         tool: 'ipf-optimizer (Go implementation)',
         test_files: {}
     };
 
-    const results = { test_run_at: new Date().toISOString(), test_files: {} };
+    const results = { test_run_at: runStartedAt, test_files: {} };
 
     const optimizationTests = Object.entries(config.TEST_FILES)
         .filter(([key, fileConfig]) => fileConfig.type === 'optimization');
 
-    for (const [key, fileConfig] of optimizationTests) {
-        logger.info(`\n--- Testing ${fileConfig.name} (${key}) ---`);
-
-        if (!fileExists(fileConfig.source)) {
-            logger.error(`Source IPF not found: ${fileConfig.source}`);
-            results.test_files[key] = { test_file: fileConfig.name, status: 'skipped', error: 'Source IPF not found', timestamp: new Date().toISOString() };
-            continue;
-        }
+    const outcomes = await mapWithConcurrency(optimizationTests, config.TEST_JOBS,
+        ([key, fileConfig]) => runOptimizationTest(key, fileConfig, originalHashes));
 
-        const tempDir = path.join(config.TEMP_DIR, `test_optimization_${key}`);
-        const tempIpf = path.join(tempDir, 'source.ipf');
-
-        try {
-            cleanup(tempDir);
-            ensureDir(tempDir);
-
-            logger.info('Copying source IPF...');
-            copyFile(fileConfig.source, tempIpf);
-
-            logger.info('Running our optimizer...');
-            const startTime = Date.now();
-            const optimizerResult = await executeCommand(
-                config.OPTIMIZER_PATH,
-                ['--backup', tempIpf],
-                config.EXECUTION_TIMEOUT
-            );
-            const elapsed = ((Date.now() - startTime) / 1000).toFixed(2);
-
-            if (!optimizerResult.success) {
-                throw new Error(optimizerResult.stderr || optimizerResult.error || 'Unknown error');
-            }
-
-            logger.success(`Optimization completed in ${elapsed}s`);
-
-            const optimizedStats = getFileInfo(tempIpf);
-            const optimizedHash = await calculateFileHash(tempIpf);
-            const optimizedFileCount = countIPFFiles(tempIpf);
-
-            logger.info(`Our optimized: ${formatBytes(optimizedStats.size)} (${optimizedHash.substring(0, 8)}...), ${optimizedFileCount} files`);
-
-            const referenceData = originalHashes.test_files[key]?.optimized;
-            if (!referenceData) {
-                logger.error(`No reference data for ${key}`);
-                results.test_files[key] = { test_file: fileConfig.name, status: 'no_reference', error: 'No reference data available', timestamp: new Date().toISOString() };
-                cleanup(tempDir);
-                continue;
-            }
-
-            logger.info(`Reference oz.exe: ${formatBytes(referenceData.size_bytes)} (${referenceData.sha256.substring(0, 8)}...), ${referenceData.file_count} files`);
-
-            const hashMatch = optimizedHash === referenceData.sha256;
-            const sizeMatch = Math.abs(optimizedStats.size - referenceData.size_bytes) === 0;
-            const countMatch = optimizedFileCount === referenceData.file_count;
-
-            logger.info('\nComparison:');
-            logger.info(`  Hash match: ${hashMatch ? '✓' : '✗'}`);
-            logger.info(`  Size match: ${sizeMatch ? '✓' : '✗'}`);
-            logger.info(`  File count match: ${countMatch ? '✓' : '✗'}`);
-
-            const perfectMatch = hashMatch && sizeMatch && countMatch;
-
-            ourHashes.test_files[key] = {
-                optimized: { test_file: fileConfig.name, size_bytes: optimizedStats.size, file_count: optimizedFileCount, sha256: optimizedHash },
-                validation: { hash_match: hashMatch, size_match: sizeMatch, count_match: countMatch, perfect_match: perfectMatch },
-                timestamp: new Date().toISOString()
-            };
-
-            results.test_files[key] = { test_file: fileConfig.name, status: 'complete', perfect_match: perfectMatch, hash_match: hashMatch, size_match: sizeMatch, count_match: countMatch, timestamp: new Date().toISOString() };
-
-            if (perfectMatch) {
-                logger.success(`${key}: Perfect match!`);
-            } else {
-                logger.error(`${key}: Validation failed`);
-            }
-
-            cleanup(tempDir);
-        } catch (error) {
-            logger.error(`Test failed: ${error.message}`);
-            results.test_files[key] = { test_file: fileConfig.name, status: 'failed', error: error.message, timestamp: new Date().toISOString() };
-            cleanup(tempDir);
-        }
-    }
+    // Record in test order regardless of which run finished first
+    optimizationTests.forEach(([key], i) => {
+        const { result, ourHash } = outcomes[i];
+        if (ourHash) ourHashes.test_files[key] = ourHash;
+        results.test_files[key] = result;
+    });
 
     await writeJson(config.OPTIMIZATION_OUR_HASHES_PATH, ourHashes, 2);
     logger.info(`Our hashes saved to: ${config.OPTIMIZATION_OUR_HASHES_PATH}`);
 
-    const totalTests = Object.keys(results.test_files).length;
-    const perfectMatches = Object.values(results.test_files).filter(t => t.perfect_match).length;
-    const successRate = totalTests > 0 ? (perfectMatches / totalTests) : 0;
+    const { totalTests, perfectMatches, successRate } = summarizeResults(results.test_files);
 
     logger.info('\n=== Test Summary ===');
     logger.info(`Total test files: ${totalTests}`);
@@ -138,6 +68,99 @@ async function execute(options) {
     return successRate === 1 ? 0 : 1;
 }
 
+/**
+ * Optimize one test IPF with our tool and compare it with the reference
+ * @param {string} key - Test file key
+ * @param {Object} fileConfig - Test file configuration
+ * @param {Object} originalHashes - Reference hash database
+ * @returns {Promise<{result: Object, ourHash: Object|undefined}>} - Test result and our hash entry
+ */
+async function runOptimizationTest(key, fileConfig, originalHashes) {
+    logger.info(`\n--- Testing ${fileConfig.name} (${key}) ---`);
+
+    if (!fileExists(fileConfig.source)) {
+        logger.error(`Source IPF not found: ${fileConfig.source}`);
+        return { result: { test_file: fileConfig.name, status: 'skipped', error: 'Source IPF not found', timestamp: new Date().toISOString() } };
+    }
+
+    // Without reference data the run can't pass, so don't spend time
+    // copying, optimizing and hashing for it
+    const referenceData = originalHashes.test_files[key]?.optimized;
+    if (!referenceData) {
+        logger.error(`No reference data for ${key}`);
+        return { result: { test_file: fileConfig.name, status: 'no_reference', error: 'No reference data available', timestamp: new Date().toISOString() } };
+    }
+
+    const tempDir = path.join(config.TEMP_DIR, `test_optimization_${key}`);
+    const tempIpf = path.join(tempDir, 'source.ipf');
+
+    try {
+        cleanup(tempDir);
+        ensureDir(tempDir);
+
+        logger.info(`${key}: Copying source IPF...`);
+        copyFile(fileConfig.source, tempIpf);
+
+        logger.info(`${key}: Running our optimizer...`);
+        const startTime = Date.now();
+        const optimizerResult = await executeCommand(
+            config.OPTIMIZER_PATH,
+            ['--backup', tempIpf],
+            config.EXECUTION_TIMEOUT,
+            STDERR_ONLY
+        );
+        const elapsed = ((Date.now() - startTime) / 1000).toFixed(2);
+
+        if (!optimizerResult.success) {
+            throw new Error(optimizerResult.stderr || optimizerResult.error || 'Unknown error');
+        }
+
+        logger.success(`${key}: Optimization completed in ${elapsed}s`);
+
+        // hashFile reports the size from the descriptor it hashed, so no separate stat
+        const { hash: optimizedHash, size: optimizedSize } = await hashFile(tempIpf);
+        const optimizedFileCount = countIPFFiles(tempIpf);
+
+        logger.info(`${key}: Our optimized: ${formatBytes(optimizedSize)} (${optimizedHash.substring(0, 8)}...), ${optimizedFileCount} files`);
+
+        logger.info(`${key}: Reference oz.exe: ${formatBytes(referenceData.size_bytes)} (${referenceData.sha256.substring(0, 8)}...), ${referenceData.file_count} files`);
+
+        const hashMatch = optimizedHash === referenceData.sha256;
+        const sizeMatch = Math.abs(optimizedSize - referenceData.size_bytes) === 0;
+        const countMatch = optimizedFileCount === referenceData.file_count;
+
+        logger.info(`\n${key}: Comparison:`);
+        logger.info(`  Hash match: ${hashMatch ? '✓' : '✗'}`);
+        logger.info(`  Size match: ${sizeMatch ? '✓' : '✗'}`);
+        logger.info(`  File count match: ${countMatch ? '✓' : '✗'}`);
+
+        const perfectMatch = hashMatch && sizeMatch && countMatch;
+
+        const finishedAt = new Date().toISOString();
+
+        const ourHash = {
+            optimized: { test_file: fileConfig.name, size_bytes: optimizedSize, file_count: optimizedFileCount, sha256: optimizedHash },
+            validation: { hash_match: hashMatch, size_match: sizeMatch, count_match: countMatch, perfect_match: perfectMatch },
+            timestamp: finishedAt
+        };
+
+        const result = { test_file: fileConfig.name, status: 'complete', perfect_match: perfectMatch, hash_match: hashMatch, size_match: sizeMatch, count_match: countMatch, timestamp: finishedAt };
+
+        if (perfectMatch) {
+            logger.success(`${key}: Perfect match!`);
+        } else {
+            logger.error(`${key}: Validation failed`);
+        }
+
+        cleanup(tempDir);
+        return { result, ourHash };
+    } catch (error) {
+        logger.error(`${key}: Test failed: ${error.message}`);
+        cleanup(tempDir);
+        return { result: { test_file: fileConfig.name, status: 'failed', error: error.message, timestamp: new Date().toISOString() } };
+    }
+}
+
 function showHelp() {
     return `
 test-optimization - Run optimization validation test
@@ -157,6 +180,7 @@ Prerequisites:
 
 Options:
     --verbose, -v      Enable detailed output
+    --jobs <n>          Run at most n test files at once (default: all)
     --help, -h         Show this help message
 
 Test Files:
@@ -1,8 +1,8 @@
 #!/usr/bin/env node
 
-const { cleanup } = require('../../filesystem');
 const Logger = require('../../logger');
 const config = require('../../config');
+const { mapWithConcurrency } = require('../command-utils');
 
 const logger = new Logger(config.LOG_LEVEL, config.LOG_SINK, config.LOG_FILE);
 
@@ -13,37 +13,23 @@ const testCreation = require('./test-creation');
 async function execute(options) {
     logger.info('=== Running All Tests ===\n');
 
-    let exitCode = 0;
-    let extractionFailed = false;
-    let optimizationFailed = false;
-    let creationFailed = false;
+    const suites = [
+        { name: 'Extraction', command: testExtraction },
+        { name: 'Optimization', command: testOptimization },
+        { name: 'Creation', command: testCreation }
+    ];
 
-    logger.info('\n' + '='.repeat(60));
-    logger.info('Running Extraction Tests...');
-    logger.info('='.repeat(60));
-    const extractionCode = await testExtraction.execute(options);
-    if (extractionCode !== 0) {
-        extractionFailed = true;
-        exitCode = 1;
-    }
-
-    logger.info('\n' + '='.repeat(60));
-    logger.info('Running Optimization Tests...');
-    logger.info('='.repeat(60));
-    const optimizationCode = await testOptimization.execute(options);
-    if (optimizationCode !== 0) {
-        optimizationFailed = true;
-        exitCode = 1;
-    }
+    // Suites use separate temp directories and output files, so their tool
+    // runs can overlap; --jobs 1 keeps them sequential
+    const exitCodes = await mapWithConcurrency(suites, config.TEST_JOBS, async (suite) => {
+        logger.info('\n' + '='.repeat(60));
+        logger.info(`Running ${suite.name} Tests...`);
+        logger.info('='.repeat(60));
+        return await suite.command.execute(options);
+    });
 
-    logger.info('\n' + '='.repeat(60));
-    logger.info('Running Creation Tests...');
-    logger.info('='.repeat(60));
-    const creationCode = await testCreation.execute(options);
-    if (creationCode !== 0) {
-        creationFailed = true;
-        exitCode = 1;
-    }
+    const [extractionFailed, optimizationFailed, creationFailed] = exitCodes.map(code => code !== 0);
+    const exitCode = exitCodes.some(code => code !== 0) ? 1 : 0;
 
     logger.info('\n' + '='.repeat(60));
     logger.info('=== Overall Test Summary ===');
@@ -59,10 +45,6 @@ async function execute(options) {
         logger.error('Some tests failed');
     }
 
-    if (!options.keep) {
-        cleanup(config.TEMP_DIR);
-    }
-
     return exitCode;
 }
 
@@ -82,6 +64,8 @@ Description:
 Options:
     --verbose, -v      Enable detailed output
     --keep              Keep extracted/optimized files for debugging
+    --jobs <n>          Run at most n suites/test files at once (default: all)
+    --temp-dir <path>   Where to create the run's output dir (default: system temp dir)
     --help, -h         Show this help message
 
 Test Suites:
@@ -98,7 +82,8 @@ Individual Tests:
 
 Output:
     - Hashes saved to: test_hashes/tools/*/our_hashes.json
-    - Test files cleaned up after run (unless --keep)
+    - Tool output written to a new ge-library-validation-XXXXXX dir under
+      the temp dir, removed after the run (--keep keeps it and prints its path)
     `;
 }
 
@@ -1,3 +1,5 @@
+const fs = require('fs');
+const os = require('os');
 const path = require('path');
 
 const PLATFORM_TARGET = 'linux-amd64';
@@ -6,7 +8,25 @@ const PLATFORM_EXT = PLATFORM_TARGET.startsWith('windows') ? '.exe' : '';
 const PROJECT_ROOT = path.resolve(__dirname, '../..');
 
 const TEST_FILES_DIR = path.join(PROJECT_ROOT, 'testing/test_files');
-const TEMP_DIR = path.join(PROJECT_ROOT, 'testing/temp');
+// Tool output goes under the system temp dir (tmpfs on most Linux hosts)
+// rather than the checkout; --temp-dir overrides it when /tmp is too small
+const TEMP_DIR_ARG_INDEX = process.argv.indexOf('--temp-dir');
+const TEMP_BASE_DIR = TEMP_DIR_ARG_INDEX !== -1 && process.argv[TEMP_DIR_ARG_INDEX + 1]
+    ? path.resolve(process.argv[TEMP_DIR_ARG_INDEX + 1])
+    : os.tmpdir();
+
+// Each run works in its own fresh directory under TEMP_BASE_DIR, created on
+// first use, so concurrent runs never share output and cleaning up never
+// touches anything the run didn't create
+let runTempDir = null;
+
+function getRunTempDir() {
+    if (runTempDir === null) {
+        fs.mkdirSync(TEMP_BASE_DIR, { recursive: true });
+        runTempDir = fs.mkdtempSync(path.join(TEMP_BASE_DIR, 'ge-library-validation-'));
+    }
+    return runTempDir;
+}
 const TEST_HASHES_DIR = path.join(PROJECT_ROOT, 'testing/test_hashes');
 
 const RELEASES_DIR = path.join(PROJECT_ROOT, 'releases');
@@ -45,13 +65,22 @@ const HASH_STRATEGY_THRESHOLD = 100;
 const SAMPLING_CONFIG = { SECTION_COUNT: 3, SAMPLES_PER_SECTION: 15, MIN_SAMPLES: 30 };
 const EXECUTION_TIMEOUT = 600000;
 
+// Test files are independent, so they run concurrently unless --jobs caps it;
+// a missing or non-positive value is null so the CLI can reject it
+const JOBS_ARG_INDEX = process.argv.indexOf('--jobs');
+const JOBS_ARG = process.argv[JOBS_ARG_INDEX + 1];
+const TEST_JOBS = JOBS_ARG_INDEX === -1 ? Infinity
+    : /^\d+$/.test(JOBS_ARG ?? '') && Number(JOBS_ARG) > 0 ? Number(JOBS_ARG) : null;
+
 const LOG_LEVEL = process.argv.includes('--verbose') || process.argv.includes('-v') ? 'verbose' : 'info';
 const LOG_SINK = 'console';
 const LOG_FILE = path.join(PROJECT_ROOT, 'testing/validation.log');
 
 module.exports = {
     PLATFORM_TARGET, PLATFORM_EXT,
-    PROJECT_ROOT, TEST_FILES_DIR, TEMP_DIR, TEST_HASHES_DIR,
+    PROJECT_ROOT, TEST_FILES_DIR, TEMP_BASE_DIR, TEST_HASHES_DIR,
+    get TEMP_DIR() { return getRunTempDir(); },
+    get TEMP_DIR_CREATED() { return runTempDir !== null; },
     RELEASES_DIR, OUR_RELEASES_DIR, OUR_BINARIES_DIR, ORIGINAL_BINARIES_DIR,
     EZ_BIN, IZ_BIN, OZ_BIN, CZ_BIN, ZI_BIN,
     getOsFileName,
@@ -61,6 +90,6 @@ module.exports = {
     CREATION_ORIGINAL_HASHES_PATH, CREATION_OUR_HASHES_PATH,
     TEST_FILES,
     HASH_STRATEGY_THRESHOLD, SAMPLING_CONFIG,
-    EXECUTION_TIMEOUT,
+    EXECUTION_TIMEOUT, TEST_JOBS,
     LOG_LEVEL, LOG_SINK, LOG_FILE
 };
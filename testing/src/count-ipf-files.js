@@ -1,7 +1,26 @@
 const fs = require('fs');
 
+// The end-of-central-directory record is 22 bytes plus a comment of at
+// most 65535 bytes, so it always sits inside this many trailing bytes
+const EOCD_SEARCH_SIZE = 22 + 65535;
+
 function countIPFFiles(filePath) {
-    const buffer = fs.readFileSync(filePath);
+    const fd = fs.openSync(filePath, 'r');
+    let buffer;
+    try {
+        const fileSize = fs.fstatSync(fd).size;
+        const tailSize = Math.min(fileSize, EOCD_SEARCH_SIZE);
+        buffer = Buffer.allocUnsafe(tailSize);
+        let bytesRead = 0;
+        while (bytesRead < tailSize) {
+            const n = fs.readSync(fd, buffer, bytesRead, tailSize - bytesRead, fileSize - tailSize + bytesRead);
+            if (n === 0) break;
+            bytesRead += n;
+        }
+        buffer = buffer.subarray(0, bytesRead);
+    } finally {
+        fs.closeSync(fd);
+    }
     const size = buffer.length;
 
     let pos = size - 22;
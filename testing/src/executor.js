@@ -7,6 +7,10 @@ const { spawn } = require('child_process');
 const os = require('os');
 const path = require('path');
 
+// Spawn options for tools whose stdout is never read; only stderr is kept
+// for error messages, so chatty progress output isn't buffered
+const STDERR_ONLY = { stdio: ['ignore', 'ignore', 'pipe'] };
+
 /**
  * Execute command with timeout
  * @param {string} command - Command to execute
@@ -17,8 +21,8 @@ const path = require('path');
  */
 async function executeCommand(command, args, timeout = 600000, options = {}) {
     return new Promise((resolve, reject) => {
-        let stdout = '';
-        let stderr = '';
+        const stdoutChunks = [];
+        const stderrChunks = [];
         let killed = false;
 
         const child = spawn(command, args, {
@@ -32,18 +36,22 @@ async function executeCommand(command, args, timeout = 600000, options = {}) {
             reject(new Error(`Command timed out after ${timeout}ms`));
         }, timeout);
 
-        child.stdout.on('data', (data) => {
-            stdout += data.toString();
-        });
+        // Either stream is absent when the caller's stdio ignores it
+        if (child.stdout) child.stdout.on('data', (data) => stdoutChunks.push(data));
+        if (child.stderr) child.stderr.on('data', (data) => stderrChunks.push(data));
 
-        child.stderr.on('data', (data) => {
-            stderr += data.toString();
-        });
+        // Decoding once at the end also keeps multi-byte characters that
+        // straddle two chunks intact
+        const stdoutText = () => Buffer.concat(stdoutChunks).toString();
+        const stderrText = () => Buffer.concat(stderrChunks).toString();
 
         child.on('close', (code) => {
             clearTimeout(timeoutId);
             if (killed) return;
 
+            const stdout = stdoutText();
+            const stderr = stderrText();
+
             if (code === 0) {
                 resolve({
                     success: true,
@@ -65,8 +73,8 @@ async function executeCommand(command, args, timeout = 600000, options = {}) {
             clearTimeout(timeoutId);
             resolve({
                 success: false,
-                stdout: stdout,
-                stderr: stderr,
+                stdout: stdoutText(),
+                stderr: stderrText(),
                 error: error.message
             });
         });
@@ -122,11 +130,13 @@ async function executeOurTool(extractorPath, args) {
     return executeCommand(
         extractorPath,
         args,
-        config.EXECUTION_TIMEOUT
+        config.EXECUTION_TIMEOUT,
+        STDERR_ONLY
     );
 }
 
 module.exports = {
+    STDERR_ONLY,
     executeCommand,
     executeWineCommand,
     executeOriginalTool,
@@ -92,15 +92,17 @@ function scanDirectory(dirPath, recursive = true) {
     const files = [];
 
     function scan(currentPath) {
-        const items = fs.readdirSync(currentPath);
+        // Dirents carry the type from the directory read itself, so only
+        // symlinks need a stat to see what they point to
+        const entries = fs.readdirSync(currentPath, { withFileTypes: true });
 
-        for (const item of items) {
-            const fullPath = path.join(currentPath, item);
-            const stat = fs.statSync(fullPath);
+        for (const dirent of entries) {
+            const fullPath = path.join(currentPath, dirent.name);
+            const entry = dirent.isSymbolicLink() ? fs.statSync(fullPath) : dirent;
 
-            if (stat.isDirectory() && recursive) {
+            if (entry.isDirectory() && recursive) {
                 scan(fullPath);
-            } else if (stat.isFile()) {
+            } else if (entry.isFile()) {
                 files.push(fullPath);
             }
         }
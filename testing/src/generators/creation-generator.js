@@ -1,4 +1,4 @@
-const { executeCommand } = require('../executor');
+const { executeCommand, STDERR_ONLY } = require('../executor');
 const { calculateDirectoryHash } = require('../hashing/hash-calculator');
 const { getFileInfo, fileExists, ensureDir, cleanup } = require('../filesystem');
 const path = require('path');
@@ -27,7 +27,8 @@ async function generate(testConfig, testKey, options) {
         const preExtractResult = await executeCommand(
             config.EXTRACTOR_PATH,
             ['-input', testConfig.source, '-output', sourceFolder],
-            config.EXECUTION_TIMEOUT
+            config.EXECUTION_TIMEOUT,
+            STDERR_ONLY
         );
 
         if (!preExtractResult.success) {
@@ -75,7 +76,8 @@ async function generate(testConfig, testKey, options) {
         const extractResult = await executeCommand(
             config.EXTRACTOR_PATH,
             ['-input', tempIpf, '-output', extractDir],
-            config.EXECUTION_TIMEOUT
+            config.EXECUTION_TIMEOUT,
+            STDERR_ONLY
         );
 
         if (!extractResult.success) {
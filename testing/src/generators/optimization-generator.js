@@ -1,6 +1,6 @@
 const { executeCommand } = require('../executor');
-const { calculateFileHash } = require('../hash');
-const { getFileInfo, copyFile, removeFile, fileExists, cleanup } = require('../filesystem');
+const { hashFile } = require('../hash');
+const { copyFile, removeFile, fileExists, cleanup } = require('../filesystem');
 const path = require('path');
 const Logger = require('../logger');
 const config = require('../config');
@@ -34,27 +34,26 @@ async function generate(testConfig, testKey, options) {
         }
         logger.debug(`oz.exe output: ${ozResult.stdout}`);
 
-        const optimizedHash = await calculateFileHash(tempIpfPath);
-        const optimizedStats = getFileInfo(tempIpfPath);
+        // hashFile reports the size from the descriptor it hashed, so no separate stat
+        const { hash: optimizedHash, size: optimizedSize } = await hashFile(tempIpfPath);
         const optimizedFileCount = countIPFFiles(tempIpfPath);
 
-        const originalHash = await calculateFileHash(testConfig.source);
-        const originalStats = getFileInfo(testConfig.source);
+        const { hash: originalHash, size: originalSize } = await hashFile(testConfig.source);
         const originalFileCount = countIPFFiles(testConfig.source);
 
-        const sizeReductionBytes = originalStats.size - optimizedStats.size;
-        const sizeReductionPercent = (sizeReductionBytes / originalStats.size) * 100;
+        const sizeReductionBytes = originalSize - optimizedSize;
+        const sizeReductionPercent = (sizeReductionBytes / originalSize) * 100;
 
         const data = {
             original: {
                 test_file: path.basename(testConfig.source),
-                size_bytes: originalStats.size,
+                size_bytes: originalSize,
                 file_count: originalFileCount,
                 sha256: originalHash
             },
             optimized: {
                 test_file: `${path.basename(testConfig.source)} (optimized)`,
-                size_bytes: optimizedStats.size,
+                size_bytes: optimizedSize,
                 file_count: optimizedFileCount,
                 sha256: optimizedHash
             },
@@ -69,8 +68,8 @@ async function generate(testConfig, testKey, options) {
         cleanup(tempDir);
         logger.success(`Optimization hashes generated successfully`);
         
-        logger.verbose(`Original: ${formatBytes(originalStats.size)} (${originalHash.substring(0, 8)}...)`);
-        logger.verbose(`Optimized: ${formatBytes(optimizedStats.size)} (${optimizedHash.substring(0, 8)}...)`);
+        logger.verbose(`Original: ${formatBytes(originalSize)} (${originalHash.substring(0, 8)}...)`);
+        logger.verbose(`Optimized: ${formatBytes(optimizedSize)} (${optimizedHash.substring(0, 8)}...)`);
         logger.verbose(`Reduction: ${formatBytes(sizeReductionBytes)} (${sizeReductionPercent.toFixed(1)}%)`);
 
         return { success: true, data };
@@ -0,0 +1,20 @@
+/**
+ * Hash batches of files off the main thread
+ * Single responsibility: Run hashFile for files handed over by hashFiles
+ */
+
+const { parentPort } = require('worker_threads');
+const { hashFile } = require('./hash');
+
+parentPort.on('message', async ({ id, files }) => {
+    const results = [];
+    for (const filePath of files) {
+        try {
+            results.push(await hashFile(filePath));
+        } catch (error) {
+            parentPort.postMessage({ id, error: `Failed to hash ${filePath}: ${error.message}` });
+            return;
+        }
+    }
+    parentPort.postMessage({ id, results });
+});
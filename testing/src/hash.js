@@ -5,128 +5,239 @@
 
 const crypto = require('crypto');
 const fs = require('fs');
+const os = require('os');
 const path = require('path');
 
+// Read size for hashing; files up to this size are hashed from a single
+// read, larger ones reuse one buffer of this size for every chunk
+const READ_CHUNK_SIZE = 1024 * 1024;
+
+// Shared by every hashFile call on this thread; the read loop never yields
+// between filling and hashing it, so calls can't interleave on the buffer
+const readBuffer = Buffer.allocUnsafe(READ_CHUNK_SIZE);
+
+// Below this many files a worker's startup costs more than it saves
+const PARALLEL_HASH_THRESHOLD = 4;
+const MAX_HASH_WORKERS = 8;
+
 /**
- * Calculate SHA-256 hash of a file (streaming for large files)
+ * Calculate SHA-256 hash of a file (chunked reads for large files)
  * @param {string} filePath - Path to file
  * @returns {Promise<string>} - SHA-256 hash as hex string
  */
-function calculateFileHash(filePath) {
-    return new Promise((resolve, reject) => {
+async function calculateFileHash(filePath) {
+    const { hash } = await hashFile(filePath);
+    return hash;
+}
+
+/**
+ * Calculate SHA-256 hash and size of a file in one pass
+ * The size comes from the same open file used for hashing, so callers
+ * building manifests don't need a separate stat per file
+ * @param {string} filePath - Path to file
+ * @returns {Promise<{hash: string, size: number}>} - Hex hash and size in bytes
+ */
+async function hashFile(filePath) {
+    const fd = fs.openSync(filePath, 'r');
+    try {
+        const size = fs.fstatSync(fd).size;
         const hash = crypto.createHash('sha256');
-        const stream = fs.createReadStream(filePath);
+        // One byte of slack lets a short read mark EOF, so small files
+        // finish after a single read
+        const readLength = Math.min(size + 1, READ_CHUNK_SIZE);
+        let position = 0;
+        while (true) {
+            const n = fs.readSync(fd, readBuffer, 0, readLength, position);
+            if (n === 0) break;
+            hash.update(readBuffer.subarray(0, n));
+            position += n;
+            if (n < readLength) break;
+        }
+        return { hash: hash.digest('hex'), size };
+    } finally {
+        fs.closeSync(fd);
+    }
+}
 
-        stream.on('data', data => hash.update(data));
-        stream.on('end', () => resolve(hash.digest('hex')));
-        stream.on('error', reject);
-    });
+let hashPool = null;
+let nextHashJobId = 0;
+
+/**
+ * Get the shared hash worker pool, starting it on first use
+ * Workers live for the whole run so every directory hashed after the first
+ * skips thread startup; they are unref'd while idle so they never keep the
+ * process alive on their own
+ * @returns {Array<Worker>} - Pool workers
+ */
+function getHashPool() {
+    if (hashPool) {
+        return hashPool;
+    }
+
+    const { Worker } = require('worker_threads');
+    const workerScript = path.join(__dirname, 'hash-worker.js');
+    const poolSize = Math.min(os.cpus().length, MAX_HASH_WORKERS);
+
+    const pool = [];
+    for (let i = 0; i < poolSize; i++) {
+        const worker = new Worker(workerScript);
+        worker.pendingJobs = new Map();
+
+        worker.on('message', ({ id, results, error }) => {
+            const job = worker.pendingJobs.get(id);
+            // Already rejected if the pool failed while this result was in flight
+            if (!job) return;
+            worker.pendingJobs.delete(id);
+            if (worker.pendingJobs.size === 0) worker.unref();
+
+            if (error) {
+                job.reject(new Error(error));
+            } else {
+                job.resolve(results);
+            }
+        });
+
+        worker.on('error', error => failHashPool(pool, error));
+        // Pool workers never exit on their own, so any exit (a non-zero code,
+        // or 0 after terminate()) leaves its jobs without an answer
+        worker.on('exit', code => failHashPool(pool, new Error(`Hash worker exited with code ${code}`)));
+
+        worker.unref();
+        pool.push(worker);
+    }
+
+    hashPool = pool;
+    return hashPool;
 }
 
 /**
- * Calculate SHA-256 hash of string content
- * @param {string} content - Content to hash
- * @returns {string} - SHA-256 hash as hex string
+ * Shut down a pool after one of its workers died
+ * Every worker's pending jobs are rejected before it is terminated, so no
+ * caller is left waiting on a promise that can never settle; the next call
+ * to getHashPool starts a fresh pool
+ * @param {Array<Worker>} pool - Pool the failed worker belongs to
+ * @param {Error} error - Error to reject pending jobs with
  */
-function calculateStringHash(content) {
-    return crypto.createHash('sha256').update(content, 'utf8').digest('hex');
+function failHashPool(pool, error) {
+    if (pool.failed) {
+        return;
+    }
+    pool.failed = true;
+    if (hashPool === pool) {
+        hashPool = null;
+    }
+
+    for (const worker of pool) {
+        for (const job of worker.pendingJobs.values()) job.reject(error);
+        worker.pendingJobs.clear();
+        worker.terminate();
+    }
 }
 
 /**
- * Calculate hash of directory (router to appropriate strategy)
- * @param {string} dirPath - Directory path
- * @param {Object} strategy - Strategy instance with calculateHash method
- * @returns {Promise<Object>} - Directory hash information
+ * Hash a batch of files on one pool worker
+ * @param {Worker} worker - Pool worker
+ * @param {Array<string>} files - Paths to hash
+ * @returns {Promise<Array<{hash: string, size: number}>>} - Results in batch order
  */
-async function calculateDirectoryHash(dirPath, strategy) {
-    const hashCalculator = await strategy.calculateHash(dirPath);
-    return hashCalculator;
+function runHashJob(worker, files) {
+    return new Promise((resolve, reject) => {
+        const id = nextHashJobId++;
+        worker.pendingJobs.set(id, { resolve, reject });
+        worker.ref();
+        worker.postMessage({ id, files });
+    });
 }
 
 /**
- * Calculate full hash of all files in directory
- * @param {string} dirPath - Directory path
- * @param {Array} files - List of file paths
- * @returns {Promise<Object>} - Full hash information
+ * Hash a list of files, spreading them over worker threads on multi-core hosts
+ * SHA-256 runs synchronously on whichever thread calls it, so the only way
+ * to hash on several cores at once is to hand files to workers
+ * @param {Array<string>} filePaths - Paths to hash
+ * @returns {Promise<Array<{hash: string, size: number}>>} - Results in input order
  */
-async function calculateFullHash(dirPath, files) {
-    const filesData = {};
-    let totalSize = 0;
-
-    for (const filePath of files) {
-        try {
-            const hash = await calculateFileHash(filePath);
-            const stat = fs.statSync(filePath);
-            const relPath = path.basename(filePath);
-
-            filesData[relPath] = {
-                hash: hash,
-                size: stat.size
-            };
-            totalSize += stat.size;
-        } catch (error) {
-            throw new Error(`Failed to hash ${filePath}: ${error.message}`);
+async function hashFiles(filePaths) {
+    const workerCount = Math.min(os.cpus().length, MAX_HASH_WORKERS, filePaths.length);
+
+    if (workerCount < 2 || filePaths.length < PARALLEL_HASH_THRESHOLD) {
+        const results = [];
+        for (const filePath of filePaths) {
+            try {
+                results.push(await hashFile(filePath));
+            } catch (error) {
+                throw new Error(`Failed to hash ${filePath}: ${error.message}`);
+            }
         }
+        return results;
     }
 
-    const manifestContent = JSON.stringify(filesData, Object.keys(filesData).sort());
-    const manifestHash = calculateStringHash(manifestContent);
+    const pool = getHashPool();
+
+    // Stripe the files so large files that sort together don't all land
+    // on the same worker
+    const batches = Array.from({ length: workerCount }, () => []);
+    filePaths.forEach((filePath, i) => batches[i % workerCount].push(filePath));
+
+    const batchResults = await Promise.all(batches.map((files, w) => runHashJob(pool[w], files)));
 
-    return {
-        strategy: 'full',
-        file_count: Object.keys(filesData).length,
-        total_size: totalSize,
-        files: filesData,
-        manifest_hash: manifestHash
-    };
+    const results = new Array(filePaths.length);
+    batchResults.forEach((batch, w) => {
+        batch.forEach((result, j) => {
+            results[j * workerCount + w] = result;
+        });
+    });
+    return results;
 }
 
 /**
- * Calculate sampling hash of selected files
- * @param {string} dirPath - Directory path
- * @param {Array} files - List of all file paths
- * @param {Array} sampledFiles - Selected file paths to hash
- * @returns {Promise<Object>} - Sampling hash information
+ * Calculate SHA-256 hash of string content
+ * @param {string} content - Content to hash
+ * @returns {string} - SHA-256 hash as hex string
  */
-async function calculateSamplingHash(dirPath, files, sampledFiles) {
-    const filesData = {};
-    let totalSize = 0;
-
-    for (const filePath of sampledFiles) {
-        try {
-            const hash = await calculateFileHash(filePath);
-            const stat = fs.statSync(filePath);
-            const relPath = path.basename(filePath);
-
-            filesData[relPath] = {
-                hash: hash,
-                size: stat.size
-            };
-            totalSize += stat.size;
-        } catch (error) {
-            throw new Error(`Failed to hash ${filePath}: ${error.message}`);
-        }
-    }
+function calculateStringHash(content) {
+    return crypto.createHash('sha256').update(content, 'utf8').digest('hex');
+}
 
-    const sampleContent = JSON.stringify(filesData, Object.keys(filesData).sort());
-    const sampleHash = calculateStringHash(sampleContent);
+/**
+ * Calculate SHA-256 hash of a file manifest
+ * Produces the same digest as hashing
+ * JSON.stringify(filesData, Object.keys(filesData).sort()), but feeds it
+ * to the hash one entry at a time instead of building the whole string
+ * @param {Object} filesData - Map of relative path to { hash, size }
+ * @returns {string} - SHA-256 hash as hex string
+ */
+function calculateManifestHash(filesData) {
+    const keys = Object.keys(filesData).sort();
+    const hash = crypto.createHash('sha256');
+
+    hash.update('{', 'utf8');
+    keys.forEach((key, i) => {
+        // The key list doubles as the replacer for nested values, exactly
+        // as in the single JSON.stringify call
+        const entry = `${i ? ',' : ''}${JSON.stringify(key)}:${JSON.stringify(filesData[key], keys)}`;
+        hash.update(entry, 'utf8');
+    });
+    hash.update('}', 'utf8');
 
-    const avgFileSize = totalSize / sampledFiles.length;
-    const estimatedTotalSize = Math.round(avgFileSize * files.length);
+    return hash.digest('hex');
+}
 
-    return {
-        strategy: 'sampling',
-        file_count: files.length,
-        total_size: estimatedTotalSize,
-        sampled_files: filesData,
-        sample_hash: sampleHash
-    };
+/**
+ * Calculate hash of directory (router to appropriate strategy)
+ * @param {string} dirPath - Directory path
+ * @param {Object} strategy - Strategy instance with calculateHash method
+ * @returns {Promise<Object>} - Directory hash information
+ */
+async function calculateDirectoryHash(dirPath, strategy) {
+    const hashCalculator = await strategy.calculateHash(dirPath);
+    return hashCalculator;
 }
 
 module.exports = {
     calculateFileHash,
+    hashFile,
+    hashFiles,
     calculateStringHash,
-    calculateDirectoryHash,
-    calculateFullHash,
-    calculateSamplingHash
+    calculateManifestHash,
+    calculateDirectoryHash
 };
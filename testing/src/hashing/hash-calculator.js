@@ -14,10 +14,11 @@ class HashCalculator {
     /**
      * Calculate directory hash using configured strategy
      * @param {string} dirPath - Directory path
+     * @param {Array<string>} [files] - Files already scanned from dirPath
      * @returns {Promise<Object>} - Hash information
      */
-    async calculate(dirPath) {
-        return await this.strategy.calculateHash(dirPath);
+    async calculate(dirPath, files) {
+        return await this.strategy.calculateHash(dirPath, files);
     }
 
     /**
@@ -81,13 +82,15 @@ function createStrategy(fileCount, config) {
  * @returns {Promise<Object>} - Hash information
  */
 async function calculateDirectoryHash(dirPath) {
-    const { analyzeDirectory } = require('../analysis/directory-analyzer');
+    const { scanDirectory } = require('../filesystem');
 
-    const analysis = await analyzeDirectory(dirPath);
-    const strategy = createStrategy(analysis.file_count, config);
+    // Strategy selection only needs the file count; the same scan is then
+    // handed to the strategy so the tree is only walked once
+    const files = scanDirectory(dirPath);
+    const strategy = createStrategy(files.length, config);
     const calculator = new HashCalculator(strategy);
 
-    return await calculator.calculate(dirPath);
+    return await calculator.calculate(dirPath, files);
 }
 
 module.exports = {
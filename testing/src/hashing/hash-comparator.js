@@ -0,0 +1,44 @@
+/**
+ * Compare directory hashes against reference hashes
+ * Single responsibility: Diff two calculateDirectoryHash results
+ */
+
+/**
+ * Compare our directory hash with a reference directory hash
+ * @param {Object} ourHash - Hash information from calculateDirectoryHash
+ * @param {Object} referenceHash - Reference hash information
+ * @returns {{perfectMatch: boolean, details: Object}} - Match flag and per-file mismatches
+ */
+function compareHashes(ourHash, referenceHash) {
+    const details = {
+        file_count_match: ourHash.file_count === referenceHash.file_count,
+        total_size_match: ourHash.total_size === referenceHash.total_size,
+        mismatches: []
+    };
+
+    const filesToCompare = ourHash.strategy === 'full' ? ourHash.files : ourHash.sampled_files;
+    const referenceFiles = referenceHash.strategy === 'full' ? referenceHash.files : referenceHash.sampled_files;
+
+    let matchedCount = 0;
+    for (const [filename, fileData] of Object.entries(filesToCompare)) {
+        const refFile = referenceFiles[filename];
+        if (!refFile) { details.mismatches.push(`${filename}: Missing in reference`); continue; }
+        matchedCount++;
+        if (fileData.hash !== refFile.hash) details.mismatches.push(`${filename}: Hash mismatch`);
+        if (fileData.size !== refFile.size) details.mismatches.push(`${filename}: Size mismatch`);
+    }
+
+    // When every reference file was found above, none can be missing from ours
+    const referenceNames = Object.keys(referenceFiles);
+    if (matchedCount < referenceNames.length) {
+        for (const filename of referenceNames) {
+            if (!filesToCompare[filename]) details.mismatches.push(`${filename}: Missing in our output`);
+        }
+    }
+
+    return { perfectMatch: details.mismatches.length === 0 && details.file_count_match && details.total_size_match, details };
+}
+
+module.exports = {
+    compareHashes
+};
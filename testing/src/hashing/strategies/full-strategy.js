@@ -3,8 +3,8 @@
  * Single responsibility: Hash every file in directory
  */
 
-const { calculateFileHash, calculateStringHash } = require('../../hash');
-const fs = require('fs');
+const { hashFiles, calculateStringHash, calculateManifestHash } = require('../../hash');
+const { scanDirectory } = require('../../filesystem');
 const path = require('path');
 
 class FullStrategy {
@@ -15,33 +15,27 @@ class FullStrategy {
     /**
      * Hash directory using full strategy
      * @param {string} dirPath - Directory path
+     * @param {Array<string>} [files] - Files already scanned from dirPath
      * @returns {Promise<Object>} - Full hash information
      */
-    async calculateHash(dirPath) {
-        const { scanDirectory } = require('../../filesystem');
-        const files = scanDirectory(dirPath);
-
+    async calculateHash(dirPath, files = scanDirectory(dirPath)) {
         const filesData = {};
         let totalSize = 0;
 
-        for (const filePath of files) {
-            try {
-                const hash = await calculateFileHash(filePath);
-                const stat = fs.statSync(filePath);
-                const relPath = path.relative(dirPath, filePath);
+        const hashes = await hashFiles(files);
+
+        files.forEach((filePath, i) => {
+            const { hash, size } = hashes[i];
+            const relPath = path.relative(dirPath, filePath);
 
-                filesData[relPath] = {
-                    hash: hash,
-                    size: stat.size
-                };
-                totalSize += stat.size;
-            } catch (error) {
-                throw new Error(`Failed to hash ${filePath}: ${error.message}`);
-            }
-        }
+            filesData[relPath] = {
+                hash: hash,
+                size: size
+            };
+            totalSize += size;
+        });
 
-        const manifestContent = JSON.stringify(filesData, Object.keys(filesData).sort());
-        const manifestHash = calculateStringHash(manifestContent);
+        const manifestHash = calculateManifestHash(filesData);
 
         return {
             strategy: this.name,
@@ -3,8 +3,8 @@
  * Single responsibility: Hash selected files (beginning/middle/end)
  */
 
-const { calculateFileHash, calculateStringHash } = require('../../hash');
-const fs = require('fs');
+const { hashFiles, calculateManifestHash } = require('../../hash');
+const { scanDirectory } = require('../../filesystem');
 const path = require('path');
 
 class SamplingStrategy {
@@ -19,34 +19,29 @@ class SamplingStrategy {
     /**
      * Hash directory using sampling strategy
      * @param {string} dirPath - Directory path
+     * @param {Array<string>} [allFiles] - Files already scanned from dirPath
      * @returns {Promise<Object>} - Sampling hash information
      */
-    async calculateHash(dirPath) {
-        const { scanDirectory } = require('../../filesystem');
-        const allFiles = scanDirectory(dirPath);
+    async calculateHash(dirPath, allFiles = scanDirectory(dirPath)) {
         const sampledFiles = this.sampleFiles(allFiles);
 
         const filesData = {};
         let totalSize = 0;
 
-        for (const filePath of sampledFiles) {
-            try {
-                const hash = await calculateFileHash(filePath);
-                const stat = fs.statSync(filePath);
-                const relPath = path.relative(dirPath, filePath);
-
-                filesData[relPath] = {
-                    hash: hash,
-                    size: stat.size
-                };
-                totalSize += stat.size;
-            } catch (error) {
-                throw new Error(`Failed to hash ${filePath}: ${error.message}`);
-            }
-        }
+        const hashes = await hashFiles(sampledFiles);
+
+        sampledFiles.forEach((filePath, i) => {
+            const { hash, size } = hashes[i];
+            const relPath = path.relative(dirPath, filePath);
+
+            filesData[relPath] = {
+                hash: hash,
+                size: size
+            };
+            totalSize += size;
+        });
 
-        const sampleContent = JSON.stringify(filesData, Object.keys(filesData).sort());
-        const sampleHash = calculateStringHash(sampleContent);
+        const sampleHash = calculateManifestHash(filesData);
 
         const avgFileSize = totalSize / sampledFiles.length;
         const estimatedTotalSize = Math.round(avgFileSize * allFiles.length);
@@ -166,11 +161,11 @@ class SamplingStrategy {
 
         const existingSet = new Set(currentSamples);
         const additionalSamples = [];
+        const step = Math.floor(allFiles.length / needed);
 
         for (let i = 0; i < allFiles.length && additionalSamples.length < needed; i++) {
             const file = allFiles[i];
             if (!existingSet.has(file)) {
-                const step = Math.floor(allFiles.length / needed);
                 if (i % step === 0) {
                     additionalSamples.push(file);
                 }